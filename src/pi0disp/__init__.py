@@ -1,21 +1,51 @@
 #
 # (c) 2025 Yoichi Tanibayashi
 #
+from importlib import import_module
 from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING
 
-from .disp.disp_base import DispBase, DispSize
-from .disp.disp_spi import DispSpi, SpiPins
-from .disp.st7789v import ST7789V
 from .utils.click_utils import click_common_opts
-from .utils.my_conf import MyConf
 from .utils.mylogger import errmsg, get_logger
-from .utils.sprite import Sprite
-from .utils.utils import (
-    ImageProcessor,
-    draw_text,
-    expand_bbox,
-    get_ip_address,
-)
+
+if TYPE_CHECKING:
+    from .disp.disp_base import DispBase, DispSize
+    from .disp.disp_spi import DispSpi, SpiPins
+    from .disp.st7789v import ST7789V
+    from .utils.my_conf import MyConf
+    from .utils.sprite import Sprite
+    from .utils.utils import (
+        ImageProcessor,
+        draw_text,
+        expand_bbox,
+        get_ip_address,
+    )
+
+# These pull in NumPy, Numba, PIL, pigpio or dynaconf, so they are
+# imported on first access (PEP 562) instead of with the package
+_LAZY_EXPORTS = {
+    "DispBase": ".disp.disp_base",
+    "DispSize": ".disp.disp_base",
+    "DispSpi": ".disp.disp_spi",
+    "SpiPins": ".disp.disp_spi",
+    "ST7789V": ".disp.st7789v",
+    "MyConf": ".utils.my_conf",
+    "Sprite": ".utils.sprite",
+    "ImageProcessor": ".utils.utils",
+    "draw_text": ".utils.utils",
+    "expand_bbox": ".utils.utils",
+    "get_ip_address": ".utils.utils",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 if __package__:
     try:
@@ -4,15 +4,23 @@
 import click
 
 from . import __version__, click_common_opts, get_logger
-from .commands.ballanime import ballanime
-from .commands.bl import bl_cmd as bl
-from .commands.coltest import coltest
-from .commands.image import image
-from .commands.lcd_check import lcd_check
-from .commands.rgb import rgb
-
-
-@click.group(invoke_without_command=True)
+from .utils.click_utils import LazyGroup
+
+# Subcommands are imported only when invoked (or listed in the help), so
+# that e.g. `bl` does not pay for importing NumPy/Numba
+COMMANDS = {
+    "ballanime": "pi0disp.commands.ballanime:ballanime",
+    "rgb": "pi0disp.commands.rgb:rgb",
+    "image": "pi0disp.commands.image:image",
+    "coltest": "pi0disp.commands.coltest:coltest",
+    "bl": "pi0disp.commands.bl:bl_cmd",
+    "lcd-check": "pi0disp.commands.lcd_check:lcd_check",
+}
+
+
+@click.group(
+    cls=LazyGroup, lazy_commands=COMMANDS, invoke_without_command=True
+)
 @click_common_opts(__version__)
 def cli(ctx: click.Context, debug: bool) -> None:
     """A CLI tool for the ST7789V Display Driver.
@@ -30,13 +38,5 @@ def cli(ctx: click.Context, debug: bool) -> None:
         print(f"{ctx.get_help()}")
 
 
-cli.add_command(ballanime)
-cli.add_command(rgb)
-cli.add_command(image)
-cli.add_command(coltest)
-cli.add_command(bl)
-cli.add_command(lcd_check)
-
-
 if __name__ == "__main__":
     cli()
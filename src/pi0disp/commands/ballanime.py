@@ -6,10 +6,12 @@ ST7789Vディスプレイで動作する、物理ベースのアニメーショ
 見た目維持・計算処理最適化版。
 """
 
-import colorsys
+import functools
 import math
 import os
+import threading
 import time
+from math import cos, sin
 from typing import List, Optional
 
 import cairo
@@ -27,6 +29,7 @@ from .. import (
 )
 from ..disp.disp_spi import SpiPins
 from ..disp.st7789v import ST7789V
+from ..utils import physics_core
 from ..utils.performance_core import RegionOptimizer
 from ..utils.process_utils import (
     calculate_average_memory_usage,
@@ -44,41 +47,41 @@ BALL_RADIUS = 20
 FONT_PATH = "Firge-Regular.ttf"
 TEXT_COLOR = (255, 255, 255)
 FPS_UPDATE_INTERVAL = 0.2
+FPS_REGION = (0, 0, 200, 50)  # FPS表示領域 (x, y, w, h)
+MODES = ("simple", "optimized", "cairo", "cairo-optimized")  # 描画モード
 
 # --- 計算最適化のみの設定 ---
 PHYSICS_SUBSTEPS = 4  # 物理精度維持
-COLLISION_CHECK_SKIP = 2  # 衝突チェックのみ軽量化
-MAX_SPEED_SQ = 1000000.0  # speed^2での比較用（1000^2）
+COLLISION_CHECK_SKIP = 2  # 衝突チェックのみ軽量化 (2のべき乗)
 
 # 事前計算済み定数
 TWO_PI = 2.0 * math.pi
-SQRT_CACHE: dict[float, float] = {}  # 平方根キャッシュ
-COS_SIN_CACHE: dict[float, tuple[float, float]] = {}  # 三角関数キャッシュ
 
+# 衝突チェックの間引きはビットマスクで判定する
+assert COLLISION_CHECK_SKIP > 0 and (
+    COLLISION_CHECK_SKIP & (COLLISION_CHECK_SKIP - 1) == 0
+), "COLLISION_CHECK_SKIP must be a power of two"
+COLLISION_CHECK_MASK = COLLISION_CHECK_SKIP - 1
 
-# --- 高速化ヘルパー関数 ---
-def fast_sqrt(value):
-    """キャッシュ付き高速平方根計算"""
-    if value in SQRT_CACHE:
-        return SQRT_CACHE[value]
-    result = math.sqrt(value)
-    if len(SQRT_CACHE) < 1000:  # キャッシュサイズ制限
-        SQRT_CACHE[value] = result
-    return result
 
+@functools.lru_cache(maxsize=None)
+def _circle_mask_image(radius: int) -> Image.Image:
+    """
+    塗りつぶし円のマスク画像 ((2r+1) x (2r+1), mode "L") を作成する。
 
-def fast_cos_sin(angle):
-    """キャッシュ付き三角関数計算"""
-    # 角度を適度に量子化してキャッシュヒット率向上
-    quantized = round(angle * 100) / 100
-    if quantized in COS_SIN_CACHE:
-        return COS_SIN_CACHE[quantized]
+    `ImageDraw.ellipse()` で1度だけ描画するので、
+    毎フレーム ellipse で描画した場合と同じピクセルになる。
+    半径ごとに1枚だけ作成し、全ボールで共有する。
+    """
+    size = radius * 2 + 1
+    mask_image = Image.new("L", (size, size), 0)
+    ImageDraw.Draw(mask_image).ellipse((0, 0, size - 1, size - 1), fill=255)
+    return mask_image
 
-    cos_val = math.cos(quantized)
-    sin_val = math.sin(quantized)
-    if len(COS_SIN_CACHE) < 500:
-        COS_SIN_CACHE[quantized] = (cos_val, sin_val)
-    return cos_val, sin_val
+
+def _make_circle_mask(radius: int) -> np.ndarray:
+    """塗りつぶし円のマスク ((2r+1) x (2r+1), bool) を作成する。"""
+    return np.asarray(_circle_mask_image(radius)) > 0
 
 
 # --- 最適化されたクラス定義 ---
@@ -89,62 +92,33 @@ class Ball(CircleSprite):
         "speed_x",
         "speed_y",
         "fill_color",
-        "speed_sq",
+        "rgb_cairo",
     )
 
     def __init__(self, x, y, radius, speed, angle, fill_color):
         super().__init__(cx=float(x), cy=float(y), radius=radius)
 
-        # 三角関数計算を事前実行
-        cos_a, sin_a = fast_cos_sin(angle)
-        self.speed_x = speed * cos_a
-        self.speed_y = speed * sin_a
-        self.speed_sq = speed * speed  # 速度の二乗を事前計算
+        # 初速 (以降の速度は _loop の SoA バッファで管理)
+        self.speed_x = speed * cos(angle)
+        self.speed_y = speed * sin(angle)
 
         self.fill_color = fill_color
-
-    def update_position(self, delta_t, screen_width, screen_height):
-        """位置更新（計算最適化版）"""
-        # インライン計算で関数呼び出しオーバーヘッド削減
-        new_cx = self.cx + self.speed_x * delta_t
-        new_cy = self.cy + self.speed_y * delta_t
-
-        # 境界チェック（分岐予測最適化）
-        r = self.radius
-        width_limit = screen_width - r
-        height_limit = screen_height - r
-
-        # X軸境界チェック
-        if new_cx <= r:
-            new_cx = r
-            self.speed_x = -self.speed_x
-        elif new_cx >= width_limit:
-            new_cx = width_limit - 1
-            self.speed_x = -self.speed_x
-
-        # Y軸境界チェック
-        if new_cy <= r:
-            new_cy = r
-            self.speed_y = -self.speed_y
-        elif new_cy >= height_limit:
-            new_cy = height_limit - 1
-            self.speed_y = -self.speed_y
-
-        # 位置更新時に速度の二乗も更新
-        self.speed_sq = (
-            self.speed_x * self.speed_x + self.speed_y * self.speed_y
+        # Cairo 描画用の色 (0.0-1.0) を事前計算
+        self.rgb_cairo = (
+            fill_color[0] / 255.0,
+            fill_color[1] / 255.0,
+            fill_color[2] / 255.0,
         )
 
-        # 位置が変わったら更新
-        self.cx = new_cx
-        self.cy = new_cy
-
     def update(self, delta_t: float):
         """Spriteインターフェース用"""
         pass
 
     def draw(self, draw: ImageDraw.ImageDraw):
-        """描画処理"""
+        """
+        Spriteインターフェース用 (`Sprite.draw` は抽象メソッド)。
+        `_loop` は NumPy / Cairo で描画するので使わない。
+        """
         # Sprite.bbox を利用 (左上, 左上, 右下, 右下)
         draw.ellipse(self.bbox, fill=self.fill_color, outline=self.fill_color)
 
@@ -154,35 +128,41 @@ class FpsCounter:
 
     __slots__ = (
         "frame_count",
-        "last_update_time",
+        "last_update_ns",
         "fps_text",
-        "_update_threshold",
+        "_update_threshold_ns",
     )
 
     def __init__(self):
         self.frame_count = 0
-        self.last_update_time = time.time()
+        # 単調増加の整数ナノ秒で計測 (時刻合わせの影響を受けない)
+        self.last_update_ns = time.monotonic_ns()
         self.fps_text = "FPS: --"
-        self._update_threshold = FPS_UPDATE_INTERVAL  # 閾値を事前計算
+        self._update_threshold_ns = int(FPS_UPDATE_INTERVAL * 1e9)
 
     def update(self) -> bool:
         """FPS更新（除算最小化）"""
         self.frame_count += 1
-        current_time = time.time()
-        elapsed = current_time - self.last_update_time
+        current_ns = time.monotonic_ns()
+        elapsed_ns = current_ns - self.last_update_ns
 
-        if elapsed >= self._update_threshold:
+        if elapsed_ns >= self._update_threshold_ns:
             # 除算を1回のみ実行
-            fps = self.frame_count / elapsed
+            fps = self.frame_count * 1e9 / elapsed_ns
             self.fps_text = f"FPS: {fps:.0f}"
             self.frame_count = 0
-            self.last_update_time = current_time
+            self.last_update_ns = current_ns
             return True
         return False
 
 
 class BenchmarkTracker:
-    """ベンチマーク計測クラス"""
+    """
+    ベンチマーク計測クラス
+
+    CPU負荷とメモリ使用量のサンプリング (psutil による /proc の読み取り) は、
+    描画ループの遅延にならないようにバックグラウンドスレッドで行う。
+    """
 
     def __init__(self, duration: float = 10.0):
         self.duration = duration
@@ -194,6 +174,8 @@ class BenchmarkTracker:
         self.pigpiod_samples: List[float] = []
         self.mem_ballanime_samples: List[int] = []
         self.mem_pigpiod_samples: List[int] = []
+        self._stop_event = threading.Event()
+        self._sampler_thread: Optional[threading.Thread] = None
 
         # pigpiod プロセスを特定
         _, pigpiod_pid = get_ballanime_pigpiod_pids()
@@ -204,7 +186,8 @@ class BenchmarkTracker:
                 self.pigpiod_process = None
 
     def start(self):
-        self.start_time = time.time()
+        # 経過時間の計測には time.monotonic を使う (時刻変更の影響を受けない)
+        self.start_time = time.monotonic()
         # 初回のCPU負荷計測（基準値）
         self.process.cpu_percent(interval=None)
         if self.pigpiod_process:
@@ -213,15 +196,22 @@ class BenchmarkTracker:
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 pass
 
-    def update(self):
-        if self.start_time is None:
-            return
-
-        self.total_frames += 1
-
-        # 1秒ごとにCPU負荷とメモリ使用量をサンプリング
-        elapsed = time.time() - self.start_time
-        if int(elapsed) > len(self.cpu_samples):
+        self._stop_event.clear()
+        self._sampler_thread = threading.Thread(
+            target=self._sampler, daemon=True
+        )
+        self._sampler_thread.start()
+
+    def stop(self):
+        """サンプリングスレッドを停止する。"""
+        self._stop_event.set()
+        if self._sampler_thread is not None:
+            self._sampler_thread.join()
+            self._sampler_thread = None
+
+    def _sampler(self):
+        """1秒ごとにCPU負荷とメモリ使用量をサンプリングする (別スレッド)。"""
+        while not self._stop_event.wait(1.0):
             try:
                 self.cpu_samples.append(
                     self.process.cpu_percent(interval=None)
@@ -240,13 +230,20 @@ class BenchmarkTracker:
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 pass
 
+    def update(self):
+        if self.start_time is None:
+            return
+
+        self.total_frames += 1
+
     def should_stop(self) -> bool:
         if self.start_time is None:
             return False
-        return (time.time() - self.start_time) >= self.duration
+        return (time.monotonic() - self.start_time) >= self.duration
 
     def get_results(self) -> dict:
-        elapsed = time.time() - (self.start_time or time.time())
+        self.stop()
+        elapsed = time.monotonic() - (self.start_time or time.monotonic())
         avg_fps = self.total_frames / elapsed if elapsed > 0 else 0
         avg_cpu = (
             sum(self.cpu_samples) / len(self.cpu_samples)
@@ -279,6 +276,40 @@ class BenchmarkTracker:
 
 
 # --- 計算最適化されたヘルパー関数 ---
+def _make_gradient_background(width: int, height: int) -> Image.Image:
+    """
+    行ごとに色が変わるグラデーションの背景画像を作成する。
+
+    y 行目の色は (y % 256, y * 2 % 256, y * 3 % 256)。
+    1行ずつ `draw.line()` する代わりに NumPy で一括生成する。
+    """
+    ys = np.arange(height, dtype=np.uint32)
+    rows = (np.stack([ys, ys * 2, ys * 3], axis=1) % 256).astype(np.uint8)
+    pixels = np.broadcast_to(rows[:, None, :], (height, width, 3))
+    return Image.fromarray(np.ascontiguousarray(pixels), "RGB")
+
+
+def _hue_palette(hues: np.ndarray) -> list[tuple[int, int, int]]:
+    """
+    色相の配列を RGB (彩度・明度 = 1.0) のリストに一括変換する。
+
+    `colorsys.hsv_to_rgb(h, 1.0, 1.0)` と同じ計算を NumPy で行う。
+    """
+    h6 = hues * 6.0
+    i = h6.astype(np.int64)
+    f = h6 - i
+    i %= 6
+    q = 1.0 - f
+    t = 1.0 - q  # colorsys と同じ丸め誤差になるように f ではなく 1 - q
+    one = np.ones_like(f)
+    zero = np.zeros_like(f)
+    r = np.choose(i, [one, q, zero, zero, t, one])
+    g = np.choose(i, [t, one, one, q, zero, zero])
+    b = np.choose(i, [zero, zero, t, one, one, q])
+    rgb = (np.stack([r, g, b], axis=1) * 255).astype(np.uint8)
+    return [tuple(c) for c in rgb.tolist()]
+
+
 def _initialize_balls_optimized(
     num_balls: int, width: int, height: int, ball_speed: float
 ) -> List[Ball]:
@@ -287,165 +318,85 @@ def _initialize_balls_optimized(
     speed = ball_speed if ball_speed is not None else 300.0
     max_attempts_per_ball = 100
 
-    # 色相計算を事前実行
-    hue_values = [i / num_balls for i in range(num_balls)]
+    # 色相計算と RGB 変換を事前に一括実行
+    hue_values = np.arange(num_balls) / num_balls
     np.random.shuffle(hue_values)
+    palette = _hue_palette(hue_values)
 
     # 配置範囲を事前計算
     min_pos = BALL_RADIUS
     max_x = width - BALL_RADIUS
     max_y = height - BALL_RADIUS
+    min_dist_sq = (BALL_RADIUS * 2) ** 2
+
+    # 配置済みボールの空間ハッシュ (セルサイズ = 直径)
+    # 重なり得るボールは同じセルか隣接する 8 セルにしか無いので、
+    # ボール数が多くても全ボールとの比較をせずに済む
+    cell_size = BALL_RADIUS * 2
+    cells: dict[tuple[int, int], list[tuple[int, int]]] = {}
+
+    # ループ内で使う関数をローカル変数に束縛 (属性探索の削減)
+    randint = np.random.randint
+
+    # 1回目の配置候補と進行方向は全ボール分を一括で生成する
+    # (重なって配置できなかった場合のみ、ボールごとに候補を引き直す)
+    first_xs = randint(min_pos, max_x, num_balls).tolist()
+    first_ys = randint(min_pos, max_y, num_balls).tolist()
+    angles = (np.random.rand(num_balls) * TWO_PI).tolist()
 
     for i in range(num_balls):
         ball_placed = False
-        hue = hue_values[i]
-
-        # RGB色を事前計算
-        rgb_float = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-        fill_color = tuple(int(c * 255) for c in rgb_float)
+        fill_color = palette[i]
 
-        for _ in range(max_attempts_per_ball):
-            x = np.random.randint(min_pos, max_x)
-            y = np.random.randint(min_pos, max_y)
+        for attempt in range(max_attempts_per_ball):
+            if attempt == 0:
+                x, y = first_xs[i], first_ys[i]
+            else:
+                x = int(randint(min_pos, max_x))
+                y = int(randint(min_pos, max_y))
 
             # 重なりチェック（距離の二乗で比較して平方根計算を回避）
-            min_dist_sq = (BALL_RADIUS * 2) ** 2
+            kx = x // cell_size
+            ky = y // cell_size
             is_valid = True
 
-            for existing_ball in balls:
-                dx = x - existing_ball.cx
-                dy = y - existing_ball.cy
-                dist_sq = dx * dx + dy * dy
-
-                if dist_sq <= min_dist_sq:
-                    is_valid = False
+            for gx in (kx - 1, kx, kx + 1):
+                for gy in (ky - 1, ky, ky + 1):
+                    for ex, ey in cells.get((gx, gy), ()):
+                        dx = x - ex
+                        dy = y - ey
+                        if dx * dx + dy * dy <= min_dist_sq:
+                            is_valid = False
+                            break
+                    if not is_valid:
+                        break
+                if not is_valid:
                     break
 
             if is_valid:
-                angle = np.random.rand() * TWO_PI
                 balls.append(
-                    Ball(x, y, BALL_RADIUS, speed, angle, fill_color)
+                    Ball(x, y, BALL_RADIUS, speed, angles[i], fill_color)
                 )
+                cells.setdefault((kx, ky), []).append((x, y))
                 ball_placed = True
                 break
 
         if not ball_placed:
-            __log.warning(f"ボール{len(balls) + 1}を配置できませんでした。")
+            __log.warning("ボール%dを配置できませんでした。", len(balls) + 1)
 
     return balls
 
 
-def _handle_ball_collisions_optimized(balls: List[Ball], frame_count: int):
-    """衝突処理（計算最適化版）"""
-    # フレームスキップで計算負荷削減（見た目への影響は最小）
-    if frame_count % COLLISION_CHECK_SKIP != 0:
-        return
-
-    num_balls = len(balls)
-    radii_sum = BALL_RADIUS * 2  # 全ボール同サイズなので事前計算
-    radii_sum_sq = radii_sum * radii_sum
-    min_dist_sq = (radii_sum * 0.05) ** 2
-
-    for i in range(num_balls):
-        ball1 = balls[i]
-        for j in range(i + 1, num_balls):
-            ball2 = balls[j]
-
-            # 距離計算（平方根回避）
-            dx = ball1.x - ball2.x
-            dy = ball1.y - ball2.y
-            dist_sq = dx * dx + dy * dy
-
-            # 早期リターン（衝突していない）
-            if dist_sq >= radii_sum_sq:
-                continue
-
-            # 極近距離処理
-            if dist_sq <= min_dist_sq:
-                # ランダム分離（三角関数キャッシュ使用）
-                angle = np.random.rand() * TWO_PI
-                cos_a, sin_a = fast_cos_sin(angle)
-                sep_dist = radii_sum * 0.55
-
-                sep_x = cos_a * sep_dist * 0.5
-                sep_y = sin_a * sep_dist * 0.5
-
-                ball1.cx += sep_x
-                ball1.cy += sep_y
-                ball2.cx -= sep_x
-                ball2.cy -= sep_y
-                continue
-
-            # 通常の衝突処理
-            # 平方根計算を1回のみ実行
-            dist = fast_sqrt(dist_sq)
-            inv_dist = 1.0 / dist  # 除算を1回のみ
-            nx = dx * inv_dist
-            ny = dy * inv_dist
-
-            # 相対速度計算
-            rel_vx = ball1.speed_x - ball2.speed_x
-            rel_vy = ball1.speed_y - ball2.speed_y
-            rel_v_normal = rel_vx * nx + rel_vy * ny
-
-            # 接近している場合のみ処理
-            if rel_v_normal < 0:
-                # 接線ベクトル
-                tx = -ny
-                ty = nx
-
-                # 速度成分分解
-                v1n = ball1.speed_x * nx + ball1.speed_y * ny
-                v1t = ball1.speed_x * tx + ball1.speed_y * ty
-                v2n = ball2.speed_x * nx + ball2.speed_y * ny
-                v2t = ball2.speed_x * tx + ball2.speed_y * ty
-
-                # 速度交換
-                new_v1x = v2n * nx + v1t * tx
-                new_v1y = v2n * ny + v1t * ty
-                new_v2x = v1n * nx + v2t * tx
-                new_v2y = v1n * ny + v2t * ty
-
-                # 速度上限チェック（二乗比較で高速化）
-                if (
-                    new_v1x * new_v1x + new_v1y * new_v1y <= MAX_SPEED_SQ
-                    and new_v2x * new_v2x + new_v2y * new_v2y <= MAX_SPEED_SQ
-                ):
-                    ball1.speed_x = new_v1x
-                    ball1.speed_y = new_v1y
-                    ball2.speed_x = new_v2x
-                    ball2.speed_y = new_v2y
-
-                    # 速度の二乗を更新
-                    ball1.speed_sq = new_v1x * new_v1x + new_v1y * new_v1y
-                    ball2.speed_sq = new_v2x * new_v2x + new_v2y * new_v2y
-
-            # 位置補正
-            overlap = radii_sum - dist
-            if overlap > 0:
-                correction = overlap * 0.4  # 補正係数
-                correction_x = correction * nx
-                correction_y = correction * ny
-
-                ball1.cx += correction_x
-                ball1.cy += correction_y
-                ball2.cx -= correction_x
-                ball2.cy -= correction_y
-
-
 def pil_to_cairo_surface(pil_image: Image.Image) -> cairo.ImageSurface:
     """PIL画像をCairo ImageSurface (ARGB32) に変換する。"""
     if pil_image.mode != "RGBA":
         pil_image = pil_image.convert("RGBA")
 
     width, height = pil_image.size
-    data = np.array(pil_image)
-    # RGB(A) to BGRA
-    data = data[:, :, [2, 1, 0, 3]]
-
     surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
     buf = surface.get_data()
-    buf[:] = data.tobytes()
+    # RGBA to BGRA (Pillow の raw エンコーダで直接変換)
+    buf[:] = pil_image.tobytes("raw", "BGRA")
     surface.mark_dirty()
     return surface
 
@@ -458,13 +409,7 @@ def cairo_surface_to_pil(
     height = surface.get_height()
     stride = surface.get_stride()
 
-    # Get buffer and wrap it in a numpy array, accounting for stride
-    buf = surface.get_data()
-    raw_data = np.frombuffer(buf, dtype=np.uint8).reshape(height, stride)
-    # Extract only the active pixel data (4 bytes per pixel for ARGB32)
-    # and reshape to 3D (height, width, 4)
-    data = raw_data[:, : width * 4].reshape(height, width, 4)
-
+    x1, y1, x2, y2 = 0, 0, width, height
     if region:
         x1, y1, x2, y2 = region
         # Ensure coordinates are within bounds
@@ -472,14 +417,167 @@ def cairo_surface_to_pil(
         x2, y2 = min(width, x2), min(height, y2)
         if x1 >= x2 or y1 >= y2:
             return Image.new("RGB", (1, 1), (0, 0, 0))
-        # Use copy to detach from the potentially changing cairo buffer
-        target_data = data[y1:y2, x1:x2, :].copy()
-    else:
-        target_data = data.copy()
 
     # Cairo FORMAT_ARGB32 is BGRA in little-endian.
-    # BGRA to RGB: select channels 2, 1, 0
-    return Image.fromarray(target_data[:, :, [2, 1, 0]], "RGB")
+    # Pillow の raw デコーダ ("BGRX") で、stride を考慮して
+    # 対象領域だけを直接 RGB に変換する (中間配列のコピーなし)。
+    # デコード結果は新しいバッファなので、cairo 側の変更の影響は受けない。
+    buf = memoryview(surface.get_data())
+    start = y1 * stride + x1 * 4
+    end = (y2 - 1) * stride + x2 * 4
+    return Image.frombuffer(
+        "RGB", (x2 - x1, y2 - y1), buf[start:end], "raw", "BGRX", stride, 1
+    )
+
+
+def _stamp_balls(
+    fb: np.ndarray, system: physics_core.BallSystem, mask: np.ndarray
+):
+    """フレームバッファ (H x W x 3, uint8) に円マスクで全ボールを描画する。"""
+    fb_h, fb_w = fb.shape[:2]
+    size = mask.shape[0]
+    for (x0, y0, _, _), color in zip(system.bboxes().tolist(), system.colors):
+        x1 = x0 + size
+        y1 = y0 + size
+        # 画面外にはみ出した部分はマスクごと切り取る
+        mx0 = max(0, -x0)
+        my0 = max(0, -y0)
+        mx1 = size - max(0, x1 - fb_w)
+        my1 = size - max(0, y1 - fb_h)
+        if mx0 >= mx1 or my0 >= my1:
+            continue
+        fb[y0 + my0 : y0 + my1, x0 + mx0 : x0 + mx1][
+            mask[my0:my1, mx0:mx1]
+        ] = color
+
+
+def _overlaps_fps_region(region: tuple) -> bool:
+    """領域 (x, y, w, h) が FPS表示領域と重なるかどうか。"""
+    rx, ry, rw, rh = region
+    fx, fy, fw, fh = FPS_REGION
+    return rx < fx + fw and fx < rx + rw and ry < fy + fh and fy < ry + rh
+
+
+def _ball_dirty_regions(
+    bboxes: np.ndarray, prev_bboxes: Optional[np.ndarray]
+) -> list:
+    """
+    ボールの再描画が必要な領域 (x, y, w, h) のリストを作る。
+
+    `BallSystem.bboxes()` の前フレームと現在の外接矩形から、移動した
+    ボールについてだけ両者を包含する矩形を NumPy で一括計算する。
+    アンチエイリアス用に 2px のマージンを付ける
+    (`Sprite.get_dirty_region()` と同じ領域)。
+
+    Args:
+        bboxes: 現在の外接矩形 (N, 4)。
+        prev_bboxes: 前フレームの外接矩形 (N, 4)。最初のフレームは None。
+    """
+    if prev_bboxes is None:
+        lo = bboxes[:, :2]
+        hi = bboxes[:, 2:]
+    else:
+        moved = (bboxes != prev_bboxes).any(axis=1)
+        lo = np.minimum(bboxes[moved, :2], prev_bboxes[moved, :2])
+        hi = np.maximum(bboxes[moved, 2:], prev_bboxes[moved, 2:])
+    lo = lo - 2
+    return np.hstack((lo, hi + 2 - lo)).tolist()
+
+
+def _merge_dirty_regions(
+    dirty_regions: list, fps_updated: bool
+) -> tuple[list, bool]:
+    """
+    再描画が必要な領域 (x, y, w, h) を結合する。
+
+    FPS領域は、FPSテキストが更新された場合か、結合後の領域と重なった
+    場合 (背景復元でテキストが消えるため) のみ Dirty とする。
+    何も変化していなければ結合処理ごと省略する。
+
+    Returns:
+        (merged_regions, fps_dirty)
+    """
+    merged_regions = (
+        RegionOptimizer.merge_regions(dirty_regions) if dirty_regions else []
+    )
+    fps_dirty = fps_updated or any(
+        _overlaps_fps_region(r) for r in merged_regions
+    )
+    if fps_dirty:
+        dirty_regions.append(FPS_REGION)
+        merged_regions = RegionOptimizer.merge_regions(dirty_regions)
+    return merged_regions, fps_dirty
+
+
+@functools.lru_cache(maxsize=32)
+def _fps_text_mask(text: str, font) -> Image.Image:
+    """
+    FPSテキストのマスク画像 ("L", FPS表示領域のサイズ) を作成する。
+
+    FPSの値は数種類しか出ないので、テキストごとにキャッシュして
+    文字の描画 (フォントのラスタライズ) を値が変わったときだけにする。
+    """
+    mask = Image.new("L", FPS_REGION[2:], 0)
+    draw_text(
+        ImageDraw.Draw(mask),
+        text,
+        font,
+        x="left",
+        y="top",
+        width=FPS_REGION[2],
+        height=FPS_REGION[3],
+        color=255,  # type: ignore[arg-type]
+    )
+    return mask
+
+
+def _draw_fps_text(fb: np.ndarray, fps_image: Image.Image, text: str, font):
+    """
+    フレームバッファの FPS表示領域に FPSテキストを描画する。
+
+    `fps_image` はフレーム間で使い回す (FPS表示領域のサイズ)。
+    """
+    fx, fy, fw, fh = FPS_REGION
+    view = fb[fy : fy + fh, fx : fx + fw]
+    fps_image.frombytes(view.tobytes())
+    fps_image.paste(TEXT_COLOR, (0, 0), _fps_text_mask(text, font))
+    view[...] = np.asarray(fps_image)
+
+
+def _display_regions(
+    display_region,
+    image: Image.Image | np.ndarray,
+    regions: list,
+    width: int,
+    height: int,
+):
+    """
+    Dirty Region をディスプレイに転送する。
+
+    `image` は PIL Image かフレームバッファ (NumPy 配列)。
+
+    列範囲が重なる領域は縦長の1領域にまとめ、転送回数 (SPIウィンドウ設定の
+    回数) を減らす。
+    """
+    for rx, ry, rw, rh in RegionOptimizer.batch_regions(
+        regions, width, height
+    ):
+        x1, y1 = max(0, rx), max(0, ry)
+        x2, y2 = min(width, rx + rw), min(height, ry + rh)
+        if x1 >= x2 or y1 >= y2:
+            continue
+        display_region(image, x1, y1, x2, y2)
+
+
+def _draw_balls_cairo(ctx: cairo.Context, balls: List[Ball]):
+    """全ボールを Cairo で描画する (メソッド参照をループ外で束縛)。"""
+    set_source_rgb = ctx.set_source_rgb
+    arc = ctx.arc
+    fill = ctx.fill
+    for ball in balls:
+        set_source_rgb(*ball.rgb_cairo)
+        arc(ball.cx, ball.cy, ball.radius, 0, TWO_PI)
+        fill()
 
 
 def _loop(
@@ -494,21 +592,61 @@ def _loop(
     capture_interval: Optional[float] = None,
 ):
     """Main animation loop."""
-    target_duration = 1.0 / target_fps
-    last_frame_time = time.time()
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    # フレーム時間は単調増加の整数ナノ秒で管理し、秒への変換は最小限にする
+    target_duration_ns = int(1e9 / target_fps)
+    min_delta_ns = target_duration_ns // 5
+    max_delta_ns = target_duration_ns * 5 // 2
+    capture_interval_ns = (
+        int(capture_interval * 1e9) if capture_interval else 0
+    )
+    # ループ内で繰り返し参照する属性を事前に束縛 (属性探索の削減)
+    _monotonic_ns = time.monotonic_ns
+    _sleep = time.sleep
+    _display = lcd.display
+    _display_region = lcd.display_region
+    _fromarray = Image.fromarray
+    _copyto = np.copyto
+
+    last_frame_ns = _monotonic_ns()
+    # 次のフレームの開始予定時刻 (絶対時刻で進め、sleep の寝過ごしを
+    # 次のフレームに持ち越さない)
+    next_frame_ns = last_frame_ns
     frame_count = 0
-    last_capture_time = 0.0
+    last_capture_ns = 0
 
-    inv_substeps = 1.0 / PHYSICS_SUBSTEPS
+    # ナノ秒 -> サブステップ1回分の秒数
+    ns_to_sub_delta_t = 1e-9 / PHYSICS_SUBSTEPS
     screen_width = lcd.size.width
     screen_height = lcd.size.height
 
+    # 物理演算用の SoA (1フレーム分をサブステップを含めて1回の呼び出しで処理)
+    ball_radius = float(balls[0].radius) if balls else float(BALL_RADIUS)
+    system = physics_core.BallSystem.from_balls(balls, ball_radius)
+    # フレーム中に変わらない引数 (画面サイズ, サブステップ数) は束縛しておく
+    _system_step = functools.partial(
+        system.step, screen_width, screen_height, PHYSICS_SUBSTEPS
+    )
+    collision_mask = COLLISION_CHECK_MASK
+    sync_balls = mode not in ("simple", "optimized")
+    prev_bboxes: Optional[np.ndarray] = None  # 前フレームの外接矩形
+
     if tracker:
         tracker.start()
 
-    # 描画バッファ
+    # 描画バッファ (フレーム間で使い回す)
     frame_image = background.copy()
 
+    # simple / optimized モード用の NumPy フレームバッファ
+    background_np = np.asarray(
+        background.convert("RGB"), dtype=np.uint8
+    ).copy()
+    fb = background_np.copy()
+    circle_mask = _make_circle_mask(int(ball_radius))
+    fps_image = Image.new("RGB", FPS_REGION[2:])
+
     # Cairo初期化
     cairo_surface = None
     cairo_ctx = None
@@ -522,54 +660,44 @@ def _loop(
 
     while True:
         frame_count += 1
-        current_time = time.time()
-        delta_t = max(
-            min(current_time - last_frame_time, target_duration * 2.5),
-            target_duration * 0.2,
+        current_ns = _monotonic_ns()
+        delta_ns = max(
+            min(current_ns - last_frame_ns, max_delta_ns), min_delta_ns
         )
-        last_frame_time = current_time
-        sub_delta_t = delta_t * inv_substeps
+        last_frame_ns = current_ns
+        sub_delta_t = delta_ns * ns_to_sub_delta_t
 
-        for _ in range(PHYSICS_SUBSTEPS):
-            for ball in balls:
-                ball.update_position(sub_delta_t, screen_width, screen_height)
-            _handle_ball_collisions_optimized(balls, frame_count)
+        _system_step(sub_delta_t, frame_count & collision_mask == 0)
+
+        # Cairo 描画などで使う Ball の座標へ書き戻す
+        # (NumPy で描画するモードは BallSystem を直接使うので不要)
+        if sync_balls:
+            for ball, x, y in zip(
+                balls, system.cx.tolist(), system.cy.tolist()
+            ):
+                ball.cx = x
+                ball.cy = y
 
         if mode == "simple":
-            # 描画処理: 毎回背景をコピーして全描画
-            frame_image.paste(background)
-            draw = ImageDraw.Draw(frame_image)
-            for ball in balls:
-                ball.draw(draw)
+            # 描画処理: 毎回背景をコピー (memcpy) して全描画
+            _copyto(fb, background_np)
+            _stamp_balls(fb, system, circle_mask)
 
             fps_counter.update()
-            draw_text(
-                draw,
-                fps_counter.fps_text,
-                font,
-                x="left",
-                y="top",
-                width=screen_width,
-                height=screen_height,
-                color=TEXT_COLOR,
-            )
+            _draw_fps_text(fb, fps_image, fps_counter.fps_text, font)
 
-            lcd.display(frame_image)
+            frame_image = _fromarray(fb)
+            _display(frame_image)
 
         elif mode == "optimized":
-            # FPS領域 (左上) は常に Dirty として扱う (残像防止のため)
-            dirty_regions = [(0, 0, 200, 50)]
-
-            for ball in balls:
-                region = ball.get_dirty_region()
-                if region:
-                    dirty_regions.append(region)
-
-            fps_counter.update()
-            merged_regions = RegionOptimizer.merge_regions(dirty_regions)
+            fps_updated = fps_counter.update()
+            bboxes = system.bboxes()
+            merged_regions, fps_dirty = _merge_dirty_regions(
+                _ball_dirty_regions(bboxes, prev_bboxes), fps_updated
+            )
 
             if merged_regions:
-                # 1. Dirty Region を背景で修復 (完全に初期化)
+                # 1. Dirty Region を背景で修復 (NumPy スライスのコピー)
                 for rx, ry, rw, rh in merged_regions:
                     x1, y1 = max(0, rx), max(0, ry)
                     x2, y2 = (
@@ -578,41 +706,26 @@ def _loop(
                     )
                     if x1 >= x2 or y1 >= y2:
                         continue
-                    patch = background.crop((x1, y1, x2, y2))
-                    frame_image.paste(patch, (x1, y1))
+                    fb[y1:y2, x1:x2] = background_np[y1:y2, x1:x2]
 
                 # 2. その領域に関連するオブジェクトを再描画 (一括)
-                draw = ImageDraw.Draw(frame_image)
-                for ball in balls:
-                    ball.draw(draw)
-
-                # 3. FPSテキストの再描画 (常に実行)
-                draw_text(
-                    draw,
-                    fps_counter.fps_text,
-                    font,
-                    x="left",
-                    y="top",
-                    width=screen_width,
-                    height=screen_height,
-                    color=TEXT_COLOR,
-                )
+                _stamp_balls(fb, system, circle_mask)
 
-                # 4. ディスプレイ更新
-                for rx, ry, rw, rh in merged_regions:
-                    x1, y1 = max(0, rx), max(0, ry)
-                    x2, y2 = (
-                        min(screen_width, rx + rw),
-                        min(screen_height, ry + rh),
-                    )
-                    if x1 >= x2 or y1 >= y2:
-                        continue
+                # 3. FPSテキストの再描画 (FPS領域が Dirty の場合)
+                if fps_dirty:
+                    _draw_fps_text(fb, fps_image, fps_counter.fps_text, font)
 
-                    # 正しいシグネチャで呼び出し: display_region(image, x0, y0, x1, y1)
-                    lcd.display_region(frame_image, x1, y1, x2, y2)
+                # 4. ディスプレイ更新
+                # (PIL Image を作らずフレームバッファから直接転送)
+                _display_regions(
+                    _display_region,
+                    fb,
+                    merged_regions,
+                    screen_width,
+                    screen_height,
+                )
 
-            for ball in balls:
-                ball.record_current_bbox()
+            prev_bboxes = bboxes
 
         elif mode == "cairo":
             # Cairoオブジェクトが初期化されていることを保証
@@ -625,29 +738,19 @@ def _loop(
             cairo_ctx.paint()
 
             # ボール描画 (アンチエイリアスあり)
-            for ball in balls:
-                r, g, b = [c / 255.0 for c in ball.fill_color]
-                cairo_ctx.set_source_rgb(r, g, b)
-                cairo_ctx.arc(ball.cx, ball.cy, ball.radius, 0, TWO_PI)
-                cairo_ctx.fill()
+            _draw_balls_cairo(cairo_ctx, balls)
 
             # PIL画像に変換
             frame_image = cairo_surface_to_pil(cairo_surface)
-            draw = ImageDraw.Draw(frame_image)
 
             fps_counter.update()
-            draw_text(
-                draw,
-                fps_counter.fps_text,
-                font,
-                x="left",
-                y="top",
-                width=screen_width,
-                height=screen_height,
-                color=TEXT_COLOR,
+            frame_image.paste(
+                TEXT_COLOR,
+                FPS_REGION[:2],
+                _fps_text_mask(fps_counter.fps_text, font),
             )
 
-            lcd.display(frame_image)
+            _display(frame_image)
 
         elif mode == "cairo-optimized":
             # Cairoオブジェクトが初期化されていることを保証
@@ -655,16 +758,11 @@ def _loop(
             assert cairo_surface is not None
             assert background_surface is not None
 
-            # FPS領域 (左上) は常に Dirty として扱う (残像防止のため)
-            dirty_regions = [(0, 0, 200, 50)]
-
-            for ball in balls:
-                region = ball.get_dirty_region()
-                if region:
-                    dirty_regions.append(region)
-
-            fps_counter.update()
-            merged_regions = RegionOptimizer.merge_regions(dirty_regions)
+            fps_updated = fps_counter.update()
+            bboxes = system.bboxes()
+            merged_regions, fps_dirty = _merge_dirty_regions(
+                _ball_dirty_regions(bboxes, prev_bboxes), fps_updated
+            )
 
             if merged_regions:
                 for rx, ry, rw, rh in merged_regions:
@@ -685,13 +783,7 @@ def _loop(
                     cairo_ctx.set_source_surface(background_surface, 0, 0)
                     cairo_ctx.paint()
 
-                    for ball in balls:
-                        r, g, b = [c / 255.0 for c in ball.fill_color]
-                        cairo_ctx.set_source_rgb(r, g, b)
-                        cairo_ctx.arc(
-                            ball.cx, ball.cy, ball.radius, 0, TWO_PI
-                        )
-                        cairo_ctx.fill()
+                    _draw_balls_cairo(cairo_ctx, balls)
 
                     cairo_ctx.restore()
 
@@ -701,39 +793,24 @@ def _loop(
                     )
                     frame_image.paste(region_image, (x1, y1))
 
-                # 3. テキストの再描画 (常に実行)
-                draw_text(
-                    ImageDraw.Draw(frame_image),
-                    fps_counter.fps_text,
-                    font,
-                    x="left",
-                    y="top",
-                    width=screen_width,
-                    height=screen_height,
-                    color=TEXT_COLOR,
-                )
-
-                # 4. ディスプレイ更新
-                for rx, ry, rw, rh in merged_regions:
-                    x1, y1 = max(0, rx), max(0, ry)
-                    x2, y2 = (
-                        min(screen_width, rx + rw),
-                        min(screen_height, ry + rh),
+                # 3. テキストの再描画 (FPS領域が Dirty の場合)
+                if fps_dirty:
+                    frame_image.paste(
+                        TEXT_COLOR,
+                        FPS_REGION[:2],
+                        _fps_text_mask(fps_counter.fps_text, font),
                     )
-                    if x1 >= x2 or y1 >= y2:
-                        continue
-                    lcd.display_region(frame_image, x1, y1, x2, y2)
 
-            for ball in balls:
-                ball.record_current_bbox()
+                # 4. ディスプレイ更新
+                _display_regions(
+                    _display_region,
+                    frame_image,
+                    merged_regions,
+                    screen_width,
+                    screen_height,
+                )
 
-        else:
-            __log.warning(f"Mode {mode} unknown, using simple.")
-            frame_image.paste(background)
-            draw = ImageDraw.Draw(frame_image)
-            for ball in balls:
-                ball.draw(draw)
-            lcd.display(frame_image)
+            prev_bboxes = bboxes
 
         if tracker:
             tracker.update()
@@ -741,19 +818,30 @@ def _loop(
                 break
 
         # キャプチャ処理
-        if capture_interval is not None and capture_interval > 0:
-            if current_time - last_capture_time >= capture_interval:
-                timestamp = time.strftime("%Y%m%d_%H%M%S")
+        if capture_interval_ns > 0:
+            if current_ns - last_capture_ns >= capture_interval_ns:
+                # ファイル名には実時刻を使う
+                now = time.time()
+                timestamp = time.strftime(
+                    "%Y%m%d_%H%M%S", time.localtime(now)
+                )
                 # ms単位の精度を追加
-                ms = int((current_time % 1) * 1000)
+                ms = int((now % 1) * 1000)
                 filename = f"capture_{timestamp}_{ms:03d}_{mode}.png"
+                if mode == "optimized":
+                    # optimized モードはフレームバッファにだけ描画している
+                    frame_image = _fromarray(fb)
                 frame_image.save(filename)
-                __log.info(f"Captured: {filename}")
-                last_capture_time = current_time
+                __log.info("Captured: %s", filename)
+                last_capture_ns = current_ns
 
-        wait_time = max(0, last_frame_time + target_duration - time.time())
-        if wait_time > 0:
-            time.sleep(wait_time)
+        next_frame_ns += target_duration_ns
+        wait_ns = next_frame_ns - _monotonic_ns()
+        if wait_ns > 0:
+            _sleep(wait_ns * 1e-9)
+        elif wait_ns < -target_duration_ns:
+            # 1フレーム以上遅れた場合は取り戻そうとせず、今を基準にする
+            next_frame_ns -= wait_ns
 
 
 # --- CLIコマンド ---
@@ -800,10 +888,7 @@ def _loop(
 @click.option(
     "--mode",
     "-m",
-    type=click.Choice(
-        ["simple", "optimized", "cairo", "cairo-optimized"],
-        case_sensitive=False,
-    ),
+    type=click.Choice(MODES, case_sensitive=False),
     default="simple",
     show_default=True,
     help="Optimization/Rendering mode",
@@ -869,13 +954,10 @@ def ballanime(
                 font_small = ImageFont.load_default()
 
             # 背景画像を生成
-            background_image = Image.new(
-                "RGB", (lcd.size.width, lcd.size.height)
+            background_image = _make_gradient_background(
+                lcd.size.width, lcd.size.height
             )
             draw = ImageDraw.Draw(background_image)
-            for y in range(lcd.size.height):
-                color = (y % 256, (y * 2) % 256, (y * 3) % 256)
-                draw.line((0, y, lcd.size.width, y), fill=color)
 
             # 静的テキスト（IPアドレスなど）を描画
             ip_address = get_ip_address()
@@ -956,10 +1038,10 @@ def ballanime(
                     f.write(
                         f"| {timestamp} | {mode} | {num_balls} | {fps} | {spi_mhz}M | {res['avg_fps']:.2f} | {res['avg_cpu']:.1f}% | {res['avg_pigpiod']:.1f}% | {res['avg_mem_ballanime']} | {res['avg_mem_pigpiod']} |\n"
                     )
-                __log.info(f"Report saved to {report_file}")
+                __log.info("Report saved to %s", report_file)
 
     except KeyboardInterrupt:
         __log.info("\n終了しました。\n")
     except Exception as e:
-        __log.error(f"エラーが発生しました: {e}")
+        __log.error("エラーが発生しました: %s", e)
         exit(1)
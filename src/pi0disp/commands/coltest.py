@@ -34,6 +34,7 @@ class Coltest:
         self.g = 255
         self.b = 255
         self.bl = 255
+        self._build_masks()
 
     def setup_history(self):
         """Setup persistent history."""
@@ -55,24 +56,23 @@ class Coltest:
         except Exception as e:
             self.log.debug("Failed to write history file: %s", e)
 
-    def generate_image(self):
-        """Generates a test image based on current state."""
+    def _build_masks(self):
+        """Precomputes the canvas area and the R/G/B circle masks.
+
+        They depend only on the display size, so they are built once
+        instead of on every redraw.
+        """
         width = self.lcd.size.width
         height = self.lcd.size.height
 
-        # 1. Start with a solid white background
-        img_np = np.full((height, width, 3), 255, dtype=np.uint8)
-
-        # 2. Define central black canvas (80% of screen)
+        # Central black canvas (80% of screen)
         canvas_w = int(width * 0.8)
         canvas_h = int(height * 0.8)
         offset_x = (width - canvas_w) // 2
         offset_y = (height - canvas_h) // 2
-        img_np[
-            offset_y : offset_y + canvas_h, offset_x : offset_x + canvas_w
-        ] = 0
+        self._canvas_box = (offset_x, offset_y, canvas_w, canvas_h)
 
-        # 3. Create layers for R, G, B circles within the canvas area
+        # Circle layout within the canvas area
         radius = int(min(canvas_w / 3.5, canvas_h / 3.299))
         radius = max(1, radius)
 
@@ -93,11 +93,8 @@ class Coltest:
             ),  # B
         ]
 
-        # Combine circle layers
-        layers = np.zeros((canvas_h, canvas_w, 3), dtype=np.uint16)
-        for i, (val, pos) in enumerate(
-            zip([self.r, self.g, self.b], positions)
-        ):
+        masks = []
+        for pos in positions:
             mask_img = Image.new("L", (canvas_w, canvas_h), 0)
             ImageDraw.Draw(mask_img).ellipse(
                 (
@@ -108,14 +105,31 @@ class Coltest:
                 ),
                 fill=255,
             )
-            layers[:, :, i] = (
-                np.array(mask_img).astype(np.uint16) * val
-            ) // 255
+            masks.append(np.asarray(mask_img) != 0)
+        self._masks = tuple(masks)
+
+    def generate_image(self):
+        """Generates a test image based on current state."""
+        width = self.lcd.size.width
+        height = self.lcd.size.height
+        offset_x, offset_y, canvas_w, canvas_h = self._canvas_box
+
+        # 1. Start with a solid white background
+        img_np = np.full((height, width, 3), 255, dtype=np.uint8)
 
-        combined = np.clip(layers, 0, 255).astype(np.uint8)
-        img_np[
+        # 2. Central black canvas
+        canvas = img_np[
             offset_y : offset_y + canvas_h, offset_x : offset_x + canvas_w
-        ] = combined
+        ]
+        canvas[...] = 0
+
+        # 3. Each channel holds exactly one circle, so write every
+        #    precomputed mask straight into its canvas channel
+        for i, (val, mask) in enumerate(
+            zip([self.r, self.g, self.b], self._masks)
+        ):
+            canvas[:, :, i] = mask * np.uint8(val)
+
         return Image.fromarray(img_np, "RGB")
 
     def print_help(self):
@@ -199,7 +213,7 @@ def coltest(ctx, rst, dc, bl, debug):
             session = Coltest(lcd, __log)
             session.run()
     except Exception as e:
-        __log.error(f"Error occurred: {e}")
+        __log.error("Error occurred: %s", e)
         exit(1)
     finally:
         click.echo("Done.")
@@ -3,16 +3,19 @@
 #
 """Display image command."""
 
+import io
 import sys
 import time
 
 import click
+import numpy as np
 from PIL import Image
 
 from .. import __version__, click_common_opts, get_logger
 from ..disp.disp_spi import SpiPins
 from ..disp.st7789v import ST7789V
-from ..utils.utils import ImageProcessor
+from ..utils.performance_core import ColorConverter
+from ..utils.utils import ImageProcessor, sleep_until
 
 __log = get_logger(__name__)
 
@@ -35,30 +38,33 @@ __log = get_logger(__name__)
 @click.option("--dc", type=int, default=24, show_default=True, help="DC PIN")
 @click.option("--bl", type=int, default=23, show_default=True, help="BL PIN")
 @click.option("--svg", is_flag=True, help="SVG flag")
+@click.option(
+    "--linear", is_flag=True, help="Apply gamma in linear light (sRGB)."
+)
 @click_common_opts(__version__)
-def image(ctx, image_path, duration, rst, dc, bl, svg, debug):
+def image(ctx, image_path, duration, rst, dc, bl, svg, linear, debug):
     """Displays an image with optional gamma correction.
 
     IMAGE_PATH: Path to the image file to display.
     """
-    import cairosvg
-
     __log = get_logger(__name__, debug)
     __log.debug(
-        "image_path=%s, duration=%s, svg=%s", image_path, duration, svg
+        "image_path=%s, duration=%s, svg=%s, linear=%s",
+        image_path,
+        duration,
+        svg,
+        linear,
     )
     __log.debug("rst=%s, dc=%s, bl=%s", rst, dc, bl)
 
-    try:
-        if svg:
-            svg_file = image_path + ".svg"
-            cairosvg.svg2png(url=image_path, write_to=svg_file)
-            source_image = Image.open(svg_file)
-        else:
+    # SVGs are rasterized once the display size is known
+    source_image = None
+    if not svg:
+        try:
             source_image = Image.open(image_path)
-    except Exception as e:
-        __log.error("Error opening image %s: %s", image_path, e)
-        sys.exit(1)
+        except Exception as e:
+            __log.error("Error opening image %s: %s", image_path, e)
+            sys.exit(1)
 
     processor = ImageProcessor()
 
@@ -70,6 +76,33 @@ def image(ctx, image_path, duration, rst, dc, bl, svg, debug):
 
             print(f"Displaying image: {image_path}")
 
+            if source_image is None:
+                # Rasterize in memory (no temporary PNG file on the SD
+                # card), straight at display resolution; the SVG's own
+                # aspect ratio is kept (centered, like fit_mode="contain")
+                try:
+                    # Imported only here: cairosvg (and cairo) is heavy to
+                    # load and not needed for raster images
+                    import cairosvg
+
+                    png_bytes = cairosvg.svg2png(
+                        url=image_path,
+                        output_width=lcd.size.width,
+                        output_height=lcd.size.height,
+                    )
+                    source_image = Image.open(io.BytesIO(png_bytes))
+                    source_image.load()
+                except Exception as e:
+                    __log.error("Error opening image %s: %s", image_path, e)
+                    sys.exit(1)
+
+            # Let libjpeg decode large JPEGs at a reduced scale (still at
+            # least twice the display size) instead of at full resolution
+            if source_image.format == "JPEG":
+                source_image.draft(
+                    "RGB", (lcd.size.width * 2, lcd.size.height * 2)
+                )
+
             # Resize while maintaining aspect ratio
             resized_image = processor.resize_with_aspect_ratio(
                 source_image,
@@ -77,21 +110,36 @@ def image(ctx, image_path, duration, rst, dc, bl, svg, debug):
                 lcd.size.height,
                 fit_mode="contain",
             )
+            # Each frame stays up until its deadline; the gamma frames are
+            # prepared while the first image is being held on screen
+            deadline = time.monotonic() + duration
             lcd.display(resized_image)
-            time.sleep(duration)
 
-            for gamma in (1.0, 1.5, 1.0, 0.5, 1.0):
+            # Gamma-correct and pack to RGB565 each distinct value only
+            # once, straight from the NumPy array (no PIL image per gamma)
+            gammas = (1.0, 1.5, 1.0, 0.5, 1.0)
+            if resized_image.mode != "RGB":
+                resized_image = resized_image.convert("RGB")
+            rgb = np.asarray(resized_image, dtype=np.uint8)
+            converter = ColorConverter()
+            frames = {}
+            for gamma in dict.fromkeys(gammas):
                 __log.debug("Applying gamma=%s", gamma)
-                corrected_image = processor.apply_gamma(
-                    resized_image, gamma=gamma
+                frames[gamma] = converter.convert(
+                    processor.apply_gamma(rgb, gamma=gamma, linear=linear)
                 )
-                lcd.display(corrected_image)
-                time.sleep(duration)
+
+            for gamma in gammas:
+                sleep_until(deadline)
+                __log.debug("Displaying gamma=%s", gamma)
+                deadline = time.monotonic() + duration
+                lcd.display_rgb565(frames[gamma])
+            sleep_until(deadline)
 
     except KeyboardInterrupt:
         pass
     except Exception as e:
-        __log.error(f"Error occurred: {e}")
+        __log.error("Error occurred: %s", e)
         sys.exit(1)
     finally:
         print("Done.")
@@ -116,6 +116,15 @@ def lcd_check(ctx, rotation, invert, bgr, wait, wizard, debug):
             "『背景が黒』『上から赤・緑・青』に見えるものを探してください。"
         )
 
+        # Draw all test patterns up front, so that each step of the loop
+        # below only sends the settings and the image
+        imgs = [
+            draw_lcd_test_pattern(
+                width, height, t["invert"], t["bgr"], i + 1, len(tests)
+            )
+            for i, t in enumerate(tests)
+        ]
+
         for i, t in enumerate(tests):
             idx = i + 1
             inv_val = t["invert"]
@@ -126,19 +135,15 @@ def lcd_check(ctx, rotation, invert, bgr, wait, wizard, debug):
             )
             print(f"[{idx}/{len(tests)}] inv={inv_val}, bgr={bgr_val}")
 
-            # Update display settings
-            disp._invert = inv_val
-            disp._bgr = bgr_val
-            disp.init_display()
-            disp.set_rotation(rotation)
-
-            # Create test pattern
-            img = draw_lcd_test_pattern(
-                width, height, inv_val, bgr_val, idx, len(tests)
-            )
+            # Update display settings: the display was fully initialized
+            # when opened, so just send the command for each changed one
+            if disp._invert != inv_val:
+                disp.set_invert(inv_val)
+            if disp._bgr != bgr_val:
+                disp.set_bgr(bgr_val)
 
-            # Display it
-            disp.display(img)
+            # Display the test pattern
+            disp.display(imgs[i])
 
             if i < len(tests) - 1:
                 if wait > 0:
@@ -3,13 +3,21 @@
 #
 """LCD Interactive Wizard components."""
 
-from typing import Any
+import contextlib
+import os
+import select
+import sys
+from typing import Any, Iterator
 
 import click
+from PIL import Image
 
 from ..utils.lcd_test_pattern import draw_lcd_test_pattern
 from ..utils.mylogger import get_logger
 
+# How long to wait for the rest of an escape sequence after ESC (seconds)
+ESC_SEQ_TIMEOUT = 0.05
+
 
 class SettingItem:
     """Base class for a display setting item."""
@@ -73,6 +81,12 @@ class WizardState:
             OffsetSettingItem("x_offset", x_offset, "h", "l"),
             OffsetSettingItem("y_offset", y_offset, "k", "j"),
         ]
+        # Direct lookups by setting name and by key (reversed so that, as
+        # in a scan of the list, the first item owning a key wins)
+        self._items_by_name = {item.name: item for item in self.items}
+        self._items_by_key = {
+            key: item for item in reversed(self.items) for key in item.keys
+        }
 
     @property
     def rotation(self) -> int:
@@ -95,16 +109,12 @@ class WizardState:
         return self._get("y_offset", 0)
 
     def _get(self, name: str, default: Any) -> Any:
-        for item in self.items:
-            if item.name == name:
-                return item.value
-        return default
+        item = self._items_by_name.get(name)
+        return default if item is None else item.value
 
     def update_by_key(self, key: str) -> bool:
-        for item in self.items:
-            if item.update(key):
-                return True
-        return False
+        item = self._items_by_key.get(key)
+        return item is not None and item.update(key)
 
     def to_dict(self) -> dict:
         return {item.name: item.value for item in self.items}
@@ -117,6 +127,11 @@ class WizardState:
 class WizardUI:
     """Base interface for Wizard UI handling."""
 
+    @contextlib.contextmanager
+    def key_input(self) -> Iterator[None]:
+        """Context for a series of get_key() calls (no-op by default)."""
+        yield
+
     def get_key(self) -> str:
         raise NotImplementedError()
 
@@ -130,14 +145,61 @@ class WizardUI:
 class ClickWizardUI(WizardUI):
     """Real implementation of WizardUI using click and console."""
 
+    def __init__(self):
+        self._fd: int | None = None  # stdin fd while in cbreak mode
+        self._last_status: str | None = None  # Last status line written
+
+    @contextlib.contextmanager
+    def key_input(self) -> Iterator[None]:
+        """
+        Put the terminal in cbreak mode once for the whole wizard.
+
+        click.getchar() switches the terminal mode on every call; here
+        each key is a single os.read(). Falls back to click.getchar()
+        when stdin is not a terminal (or termios is unavailable).
+        """
+        try:
+            import termios
+            import tty
+
+            fd = sys.stdin.fileno()
+            if not os.isatty(fd):
+                raise OSError("stdin is not a tty")
+            old_attrs = termios.tcgetattr(fd)
+        except (ImportError, OSError, ValueError):
+            yield
+            return
+
+        tty.setcbreak(fd)
+        self._fd = fd
+        try:
+            yield
+        finally:
+            self._fd = None
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+
     def get_key(self) -> str:
-        return click.getchar()
+        if self._fd is None:
+            return click.getchar()
+        key = os.read(self._fd, 1)
+        if key == b"\x1b":
+            # Escape sequences (arrow keys, etc.) arrive byte by byte here;
+            # read the rest so that e.g. the "C" of Right ("\x1b[C") is not
+            # taken as a rotation key. The sequence is returned as one key,
+            # as click.getchar() does.
+            while select.select([self._fd], [], [], ESC_SEQ_TIMEOUT)[0]:
+                key += os.read(self._fd, 32)
+        return key.decode(errors="ignore")
 
     def show_status(self, state: WizardState):
         status = f"Rot:{state.rotation:3} Inv:{str(state.invert):5} BGR:{str(state.bgr):5} Off:({state.x_offset},{state.y_offset})"
-        print(
-            f"\rCurrent: {status} (a-d,i,g,hjkl,ENTER,q) ", end="", flush=True
-        )
+        line = f"\rCurrent: {status} (a-d,i,g,hjkl,ENTER,q) "
+        # Keys that change nothing leave the line as it is
+        if line == self._last_status:
+            return
+        self._last_status = line
+        sys.stdout.write(line)
+        sys.stdout.flush()
 
     def show_help(self):
         print("\n--- LCD Interactive Wizard ---")
@@ -168,38 +230,88 @@ class LCDWizard:
             x_offset=disp._x_offset,
             y_offset=disp._y_offset,
         )
+        # Test patterns by (width, height, invert, bgr): there are only a
+        # few combinations, so each is drawn once per session
+        self._patterns: dict[tuple[int, int, bool, bool], Image.Image] = {}
+
+    def _test_pattern(self, width: int, height: int) -> Image.Image:
+        """Returns the test pattern for the current settings."""
+        key = (width, height, self.state.invert, self.state.bgr)
+        img = self._patterns.get(key)
+        if img is None:
+            img = draw_lcd_test_pattern(*key)
+            self._patterns[key] = img
+        return img
 
     def run(self) -> dict:
         """Run the interactive loop."""
         self.ui.show_help()
 
-        while True:
-            # Update hardware
-            self.disp._invert = self.state.invert
-            self.disp._bgr = self.state.bgr
-            self.disp._x_offset = self.state.x_offset
-            self.disp._y_offset = self.state.y_offset
-            self.disp.init_display()
-            self.disp.set_rotation(self.state.rotation)
+        applied: dict | None = None  # Settings currently on the hardware
 
-            # Draw test pattern
-            width, height = self.disp.size.width, self.disp.size.height
-            self.disp._last_image = None  # Force clear
-            img = draw_lcd_test_pattern(
-                width, height, self.state.invert, self.state.bgr
-            )
-            self.disp.display(img, full=True)
+        with self.ui.key_input():
+            while True:
+                settings = self.state.to_dict()
+                if settings != applied:
+                    full = self._apply_settings(applied)
+                    applied = settings
 
-            self.ui.show_status(self.state)
+                    # Draw test pattern
+                    width, height = (
+                        self.disp.size.width,
+                        self.disp.size.height,
+                    )
+                    img = self._test_pattern(width, height)
+                    self.disp.display(img, full=full)
 
-            key = self.ui.get_key().lower()
-            if key in ["\r", "\n"]:
-                print("\n設定を確定しました。")
-                break
-            elif key == "q":
-                print("\n中断しました。")
-                raise click.Abort()
+                self.ui.show_status(self.state)
 
-            self.state.update_by_key(key)
+                key = self.ui.get_key().lower()
+                if key in ["\r", "\n"]:
+                    print("\n設定を確定しました。")
+                    break
+                elif key == "q":
+                    print("\n中断しました。")
+                    raise click.Abort()
+
+                self.state.update_by_key(key)
 
         return self.state.to_dict()
+
+    def _apply_settings(self, applied: dict | None) -> bool:
+        """
+        Send only what changed since `applied` to the display.
+
+        The full init sequence (with its SLPOUT delay) runs only the first
+        time; afterwards invert is a single INVON/INVOFF, rotation and BGR
+        share one MADCTL write, and offsets take effect on the next window
+        set by `display()`.
+
+        Returns True if the whole screen has to be rewritten: after the
+        init sequence, or when rotation or offsets move the image in the
+        panel's memory. Invert and BGR are applied by the panel to what it
+        already holds, so only the changed status text needs to be sent.
+        """
+        state = self.state
+        self.disp._invert = state.invert
+        self.disp._bgr = state.bgr
+        self.disp._x_offset = state.x_offset
+        self.disp._y_offset = state.y_offset
+
+        if applied is None:
+            self.disp.init_display()
+            self.disp.set_rotation(state.rotation)
+            return True
+
+        if state.invert != applied["invert"]:
+            self.disp.set_invert(state.invert)
+        if state.rotation != applied["rotation"]:
+            self.disp.set_rotation(state.rotation)
+        elif state.bgr != applied["bgr"]:
+            self.disp.set_bgr(state.bgr)
+
+        return (
+            state.rotation != applied["rotation"]
+            or state.x_offset != applied["x_offset"]
+            or state.y_offset != applied["y_offset"]
+        )
@@ -3,6 +3,8 @@
 #
 """Display RGB color circles command."""
 
+import functools
+import math
 import time
 from typing import Tuple
 
@@ -13,21 +15,19 @@ from PIL import Image, ImageDraw
 from .. import __version__, click_common_opts, get_logger
 from ..disp.disp_spi import SpiPins
 from ..disp.st7789v import ST7789V
+from ..utils.performance_core import ColorConverter
+from ..utils.utils import sleep_until
 
 __log = get_logger(__name__)
 
+_SQRT3 = math.sqrt(3)
 
-def generate_rgb_circles(
-    width: int,
-    height: int,
-    colors_tuple: Tuple[
-        Tuple[int, int, int], Tuple[int, int, int], Tuple[int, int, int]
-    ],
-) -> Image.Image:
-    """Generates an image with three overlapping RGB circles using additive blending."""
-    # Create a black background NumPy array
-    final_image_np = np.zeros((height, width, 3), dtype=np.uint8)
 
+@functools.lru_cache(maxsize=8)
+def _circle_geometry(
+    width: int, height: int
+) -> Tuple[int, Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int]]]:
+    """Returns the radius and the (red, green, blue) circle centers."""
     # Calculate optimal radius to fit the screen
     radius = int(min(width / 3.5, height / 3.299))
 
@@ -40,36 +40,68 @@ def generate_rgb_circles(
     # Calculate side length of equilateral triangle
     s = radius * 1.2
 
-    center_y = int(height // 2 + s / (4 * np.sqrt(3)))
+    center_y = int(height // 2 + s / (4 * _SQRT3))
 
     # Calculate coordinates for equilateral triangle vertices
     # Centroid of the triangle is effectively at (center_x, center_y) after adjustment
     # Red (top vertex)
-    red_pos = (int(center_x), int(center_y - s / np.sqrt(3)))
+    red_pos = (int(center_x), int(center_y - s / _SQRT3))
     # Green (bottom-left vertex)
-    green_pos = (int(center_x - s / 2), int(center_y + s / (2 * np.sqrt(3))))
+    green_pos = (int(center_x - s / 2), int(center_y + s / (2 * _SQRT3)))
     # Blue (bottom-right vertex)
-    blue_pos = (int(center_x + s / 2), int(center_y + s / (2 * np.sqrt(3))))
-
-    # Helper function to draw a single opaque circle on a black background
-    def draw_opaque_circle(color, pos, radius, img_width, img_height):
-        img = Image.new("RGB", (img_width, img_height), (0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        draw.ellipse(
-            (
-                pos[0] - radius,
-                pos[1] - radius,
-                pos[0] + radius,
-                pos[1] + radius,
-            ),
-            fill=color,
-        )
-        return np.array(img, dtype=np.uint8)
-
-    # Draw each circle and add its pixel values to the final image
-    for color, pos in zip(colors_tuple, [red_pos, green_pos, blue_pos]):
-        circle_np = draw_opaque_circle(color, pos, radius, width, height)
-        final_image_np = np.clip(final_image_np + circle_np, 0, 255)
+    blue_pos = (int(center_x + s / 2), int(center_y + s / (2 * _SQRT3)))
+
+    return radius, (red_pos, green_pos, blue_pos)
+
+
+@functools.lru_cache(maxsize=8)
+def _circle_mask(radius: int) -> np.ndarray:
+    """Returns a read-only boolean mask of a circle in its bounding box."""
+    diameter = 2 * radius + 1
+    mask_img = Image.new("L", (diameter, diameter), 0)
+    ImageDraw.Draw(mask_img).ellipse(
+        (0, 0, diameter - 1, diameter - 1), fill=255
+    )
+    mask = np.asarray(mask_img) > 0
+    mask.flags.writeable = False
+    return mask
+
+
+def generate_rgb_circles(
+    width: int,
+    height: int,
+    colors_tuple: Tuple[
+        Tuple[int, int, int], Tuple[int, int, int], Tuple[int, int, int]
+    ],
+) -> Image.Image:
+    """Generates an image with three overlapping RGB circles using additive blending."""
+    # Create a black background NumPy array
+    final_image_np = np.zeros((height, width, 3), dtype=np.uint8)
+
+    # The geometry and the circle mask depend only on the screen size,
+    # so they are computed once; each call only adds the colors
+    radius, positions = _circle_geometry(width, height)
+    mask = _circle_mask(radius)
+    diameter = 2 * radius + 1
+
+    for color, pos in zip(colors_tuple, positions):
+        # Clip the bounding box to the screen
+        x0, y0 = pos[0] - radius, pos[1] - radius
+        left, top = max(x0, 0), max(y0, 0)
+        right = min(x0 + diameter, width)
+        bottom = min(y0 + diameter, height)
+        if right <= left or bottom <= top:
+            continue
+        region = final_image_np[top:bottom, left:right]
+        region_mask = mask[top - y0 : bottom - y0, left - x0 : right - x0]
+
+        for c, value in enumerate(color):
+            if value == 0:
+                continue
+            channel = region[..., c]
+            inside = channel[region_mask]
+            # Saturating add (uint8 would wrap around on overlap)
+            channel[region_mask] = inside + np.minimum(value, 255 - inside)
 
     return Image.fromarray(final_image_np, "RGB")
 
@@ -108,33 +140,43 @@ def rgb(ctx, duration, rst, dc, bl, debug):
                 ((0, 0, 255), (255, 0, 0), (0, 255, 0)),  # B, R, G
             ]
 
-            print("Starting RGB color cycle... Ctrl+C to stop.")
-            while True:
-                for colors_tuple in color_permutations:
+            # The images never change: generate them and pack them to
+            # RGB565 once, outside the loop
+            converter = ColorConverter()
+            frames = []
+            for colors_tuple in color_permutations:
+                __log.debug(
+                    "Generating RGB circles image with colors: %s",
+                    colors_tuple,
+                )
+                rgb_circles_image = generate_rgb_circles(
+                    lcd.size.width, lcd.size.height, colors_tuple
+                )
+                frames.append(
+                    converter.convert(np.asarray(rgb_circles_image))
+                )
+
+                # Save the generated image to a file (optional, for debugging)
+                if debug:
+                    output_filename = "/tmp/rgb_circles_command.png"
+                    rgb_circles_image.save(output_filename)
                     __log.debug(
-                        "Generating RGB circles image with colors: %s",
-                        colors_tuple,
+                        "RGB circles image saved to %s", output_filename
                     )
-                    rgb_circles_image = generate_rgb_circles(
-                        lcd.size.width, lcd.size.height, colors_tuple
-                    )
-
-                    # Save the generated image to a file (optional, for debugging)
-                    if debug:
-                        output_filename = "/tmp/rgb_circles_command.png"
-                        rgb_circles_image.save(output_filename)
-                        __log.debug(
-                            "RGB circles image saved to %s", output_filename
-                        )
 
+            print("Starting RGB color cycle... Ctrl+C to stop.")
+            while True:
+                for pixel_bytes in frames:
                     __log.debug(
                         "Displaying RGB circles for %s seconds...", duration
                     )
-                    lcd.display(rgb_circles_image)
-                    time.sleep(duration)
+                    # The SPI transfer counts toward the display time
+                    deadline = time.monotonic() + duration
+                    lcd.display_rgb565(pixel_bytes)
+                    sleep_until(deadline)
 
     except KeyboardInterrupt:
         print("\nFinished.")
     except Exception as e:
-        __log.error(f"Error occurred: {e}")
+        __log.error("Error occurred: %s", e)
         exit(1)
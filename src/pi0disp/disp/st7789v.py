@@ -39,7 +39,10 @@ class ST7789V(DispSpi):
         "COLMOD": 0x3A,
     }
 
-    CHUNK_SIZE = 4096  # Optimized for SPI throughput on Pi
+    # 1回の spi_write で送るバイト数。spi_write は pigpiod との往復
+    # (ソケット通信) になるので、なるべく大きくして回数を減らす
+    # (pigpio の上限は 64KiB)
+    CHUNK_SIZE = 32768
 
     def __init__(
         self,
@@ -114,6 +117,11 @@ class ST7789V(DispSpi):
         # Initialize core components
         self._color_converter = ColorConverter()
         self._last_image: Optional[Image.Image] = None
+        # 直前に全画面に書き込んだ RGB565 データ (同一フレームの再送防止用)
+        self._last_pixel_bytes: Optional[bytes] = None
+        # パネルに設定済みの CASET/RASET の値 (同じ値の再送防止用)
+        self._last_caset: Optional[list[int]] = None
+        self._last_raset: Optional[list[int]] = None
 
         self.init_display()
         # Ensure rotation is int
@@ -123,6 +131,8 @@ class ST7789V(DispSpi):
     def init_display(self):
         """ハードウェア初期化シーケンス"""
         super().init_display()
+        self._last_pixel_bytes = None  # リセットで表示内容は失われる
+        self._last_caset = self._last_raset = None
         self._write_command(self._CMD["SLPOUT"])
         time.sleep(0.120)
         self._write_command(self._CMD["COLMOD"])
@@ -135,6 +145,24 @@ class ST7789V(DispSpi):
         self._write_command(self._CMD["DISPON"])
         time.sleep(0.1)
 
+    def set_invert(self, invert: bool):
+        """
+        色反転 (INVON/INVOFF) だけを切り替える。
+
+        `init_display()` (SLPOUT の待ち時間を含む初期化シーケンス) を
+        やり直さずに済む。
+        """
+        self._invert = invert
+        if hasattr(self, "spi_handle"):
+            self._write_command(self._CMD["INVON" if invert else "INVOFF"])
+
+    def set_bgr(self, bgr: bool):
+        """
+        RGB/BGR の並びだけを切り替える (MADCTL を書き直すだけ)。
+        """
+        self._bgr = bgr
+        self.set_rotation(self.rotation)
+
     def set_rotation(self, rotation: int):
         """ディスプレイの回転を設定する"""
         madctl_values = {
@@ -147,6 +175,8 @@ class ST7789V(DispSpi):
             raise ValueError("Rotation must be 0, 90, 180, or 270.")
 
         self.rotation = rotation
+        self._last_pixel_bytes = None
+        self._last_caset = self._last_raset = None
         if rotation in [self.EAST, self.WEST]:
             self._size = DispSize(320, 240)
         else:
@@ -161,7 +191,13 @@ class ST7789V(DispSpi):
             self._write_data(madctl)
 
     def set_window(self, x0: int, y0: int, x1: int, y1: int):
-        """描画ウィンドウを設定する"""
+        """
+        描画ウィンドウを設定する。
+
+        CASET/RASET の値は RAMWR の後もパネルに残るので、前回と同じ値の
+        コマンドは送らない (コマンドごとに pigpiod との往復が発生するため)。
+        RAMWR は書き込み位置をウィンドウの先頭に戻すので毎回送る。
+        """
         if self._mv:
             tx0, tx1 = x0 + self._y_offset, x1 + self._y_offset
             ty0, ty1 = y0 + self._x_offset, y1 + self._x_offset
@@ -169,14 +205,21 @@ class ST7789V(DispSpi):
             tx0, tx1 = x0 + self._x_offset, x1 + self._x_offset
             ty0, ty1 = y0 + self._y_offset, y1 + self._y_offset
 
-        self._write_command(self._CMD["CASET"])
-        self._write_data([tx0 >> 8, tx0 & 0xFF, tx1 >> 8, tx1 & 0xFF])
-        self._write_command(self._CMD["RASET"])
-        self._write_data([ty0 >> 8, ty0 & 0xFF, ty1 >> 8, ty1 & 0xFF])
+        caset = [tx0 >> 8, tx0 & 0xFF, tx1 >> 8, tx1 & 0xFF]
+        if caset != self._last_caset:
+            self._write_command(self._CMD["CASET"])
+            self._write_data(caset)
+            self._last_caset = caset
+        raset = [ty0 >> 8, ty0 & 0xFF, ty1 >> 8, ty1 & 0xFF]
+        if raset != self._last_raset:
+            self._write_command(self._CMD["RASET"])
+            self._write_data(raset)
+            self._last_raset = raset
         self._write_command(self._CMD["RAMWR"])
 
     def write_pixels(self, pixel_bytes: bytes):
         """ピクセルデータを書き込む"""
+        self._last_pixel_bytes = None
         data_len = len(pixel_bytes)
 
         self._set_dc_level(1)
@@ -185,9 +228,11 @@ class ST7789V(DispSpi):
         if data_len <= self.CHUNK_SIZE:
             self.pi.spi_write(self.spi_handle, pixel_bytes)
         else:
+            # memoryview でスライスしてチャンクごとのコピーを避ける
+            view = memoryview(pixel_bytes)
             for i in range(0, data_len, self.CHUNK_SIZE):
                 self.pi.spi_write(
-                    self.spi_handle, pixel_bytes[i : i + self.CHUNK_SIZE]
+                    self.spi_handle, view[i : i + self.CHUNK_SIZE]
                 )
         self._set_cs_level(1)
 
@@ -207,6 +252,7 @@ class ST7789V(DispSpi):
             self.set_window(0, 0, self.size.width - 1, self.size.height - 1)
             self.write_pixels(pixel_bytes)
             self._last_image = image.copy()
+            self._last_pixel_bytes = pixel_bytes
             return
 
         # 前回のイメージとの差分領域 (Bounding Box) を高速に取得
@@ -231,17 +277,70 @@ class ST7789V(DispSpi):
         else:
             self._last_image = image.copy()
 
+    def display_rgb565(
+        self,
+        pixel_bytes: bytes,
+        image: Optional[Image.Image] = None,
+        full: bool = False,
+    ):
+        """
+        RGB565 (ビッグエンディアン) に変換済みの全画面データを表示。
+
+        同じ画像を何度も表示する場合などに、変換を事前に1回だけ
+        済ませておくためのもの (`ColorConverter.convert()` の出力を渡す)。
+        直前に全画面表示したデータと同じ内容なら転送を省略する。
+
+        Args:
+            pixel_bytes: 全画面分の RGB565 バイト列。
+            image: `pixel_bytes` の元画像。指定すると次回の `display()` の
+                   差分検出に使う。省略時は次回の `display()` が全画面更新になる。
+            full: True の場合、同じ内容でも必ず転送する。
+        """
+        expected = self.size.width * self.size.height * 2
+        if len(pixel_bytes) != expected:
+            raise ValueError(
+                f"pixel_bytes must be {expected} bytes, got {len(pixel_bytes)}"
+            )
+        if not full and pixel_bytes == self._last_pixel_bytes:
+            if image is not None:
+                self._last_image = image.copy()
+            return
+        self.set_window(0, 0, self.size.width - 1, self.size.height - 1)
+        self.write_pixels(pixel_bytes)
+        self._last_image = image.copy() if image is not None else None
+        self._last_pixel_bytes = bytes(pixel_bytes)
+
     def display_region(
-        self, image: Image.Image, x0: int, y0: int, x1: int, y1: int
+        self,
+        image: Image.Image | np.ndarray,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int,
     ):
-        """部分更新"""
+        """
+        部分更新
+
+        `image` には全画面の PIL Image の他に、(H, W, 3) の uint8 の
+        NumPy 配列 (フレームバッファ) も渡せる。配列の場合は
+        PIL Image を経由せずにスライスをそのまま RGB565 に変換する。
+        """
         region = clamp_region(
             (x0, y0, x1, y1), self.size.width, self.size.height
         )
         if region[2] <= region[0] or region[3] <= region[1]:
             return
-        region_img = image.crop(region)
-        img_array = np.array(region_img)
+        if isinstance(image, np.ndarray):
+            img_array = image[region[1] : region[3], region[0] : region[2]]
+            # 小さな領域では Image.fromarray() のオーバーヘッドが大きいので、
+            # バイト列から直接 _last_image 更新用の画像を作る
+            region_img = Image.new(
+                "RGB", (region[2] - region[0], region[3] - region[1])
+            )
+            region_img.frombytes(img_array.tobytes())
+        else:
+            region_img = image.crop(region)
+            img_array = np.array(region_img)
         pixel_bytes = self._color_converter.convert(img_array)
         self.set_window(region[0], region[1], region[2] - 1, region[3] - 1)
         self.write_pixels(pixel_bytes)
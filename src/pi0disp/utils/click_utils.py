@@ -1,6 +1,8 @@
 #
 # (c) 2025 Yoichi Tanibayashi
 #
+import importlib
+
 import click
 
 
@@ -47,3 +49,33 @@ def click_common_opts(
         return click.pass_context(func)
 
     return _decorator
+
+
+class LazyGroup(click.Group):
+    """
+    サブコマンドのモジュールを、そのコマンドが使われる時に初めて
+    import するグループ。
+
+    `lazy_commands` は {コマンド名: "モジュール:属性名"}。
+    NumPy などの重いモジュールを使わないコマンドの起動を速くする。
+    """
+
+    def __init__(
+        self, *args, lazy_commands: dict[str, str] | None = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(
+            set(super().list_commands(ctx)) | set(self.lazy_commands)
+        )
+
+    def get_command(
+        self, ctx: click.Context, cmd_name: str
+    ) -> click.Command | None:
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            module_name, attr = self.lazy_commands[cmd_name].split(":")
+            cmd = getattr(importlib.import_module(module_name), attr)
+            self.add_command(cmd, cmd_name)
+        return super().get_command(ctx, cmd_name)
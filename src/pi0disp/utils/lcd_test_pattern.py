@@ -3,8 +3,10 @@
 #
 """LCD Test Pattern drawing utility."""
 
+import functools
 import os
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 #
@@ -24,6 +26,7 @@ WIZARD_BG = {
 }
 
 
+@functools.lru_cache(maxsize=8)
 def get_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
     """Finds a font from the system and returns it."""
     font_paths = [
@@ -39,23 +42,8 @@ def get_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
     return ImageFont.load_default()
 
 
-def draw_lcd_test_pattern(
-    width: int,
-    height: int,
-    invert: bool,
-    bgr: bool,
-    index: int = 0,
-    total: int = 0,
-) -> Image.Image:
-    """
-    Draws a test pattern for LCD verification.
-    """
-    img = Image.new("RGB", (width, height), "black")
-    draw = ImageDraw.Draw(img)
-
-    # Background
-    draw.rectangle([0, 0, width, height], fill="black")
-
+def _layout(width: int, height: int) -> tuple[int, int, int, int]:
+    """Returns (margin, band height, mid font size, small font size)."""
     # Dynamic scaling based on screen size
     # Margin is 5% of width
     margin = max(4, width // 20)
@@ -63,43 +51,29 @@ def draw_lcd_test_pattern(
     # Band height: 10% of height, max 30px to save space for text in portrait
     bh = min(height // 10, 32)
 
-    # 1. Color bands at top
-    draw.rectangle([0, 0, width, bh], fill="#FF0000")
-    draw.rectangle([0, bh, width, bh * 2], fill="#00FF00")
-    draw.rectangle([0, bh * 2, width, bh * 3], fill="#0000FF")
-
-    # 2. Text scaling
     # Medium font: ~1/12 of smaller dimension
     # Small font: ~1/16 of smaller dimension
     base_dim = min(width, height)
     f_mid_size = max(14, base_dim // 12)
     f_sm_size = max(12, base_dim // 16)
 
-    f_mid = get_font(f_mid_size)
-    f_sm = get_font(f_sm_size)
-
-    # 3. Display settings
-    y_offset = bh * 3 + margin
+    return margin, bh, f_mid_size, f_sm_size
 
-    if total > 0:
-        draw.text(
-            (margin, y_offset),
-            f"TEST {index}/{total}",
-            fill="white",
-            font=f_mid,
-        )
-        y_offset += f_mid_size + 4
 
-    conf_text = f"inv={invert}, bgr={bgr}"
-    draw.text((margin, y_offset), conf_text, fill="cyan", font=f_mid)
+def _guide_top(width: int, height: int) -> int:
+    """Returns the y coordinate of the guide text at the bottom."""
+    margin, _, _, f_sm_size = _layout(width, height)
+    # Calculate spacing to avoid overlap in short screens
+    line_spacing = f_sm_size + 4
+    return height - (line_spacing * 2 + margin)
 
-    # Show rotation if we can detect it (width/height ratio often indicates it)
-    # But since we are in the wizard, we just show what we know.
 
-    # 4. Guide at bottom
-    # Calculate spacing to avoid overlap in short screens
+def _draw_guide(draw: ImageDraw.ImageDraw, width: int, height: int):
+    """Draws the guide text at the bottom."""
+    margin, _, _, f_sm_size = _layout(width, height)
+    f_sm = get_font(f_sm_size)
     line_spacing = f_sm_size + 4
-    y_guide = height - (line_spacing * 2 + margin)
+    y_guide = _guide_top(width, height)
 
     draw.text(
         (margin, y_guide), "If R/G/B & Black look OK,", fill="gray", font=f_sm
@@ -111,7 +85,74 @@ def draw_lcd_test_pattern(
         font=f_sm,
     )
 
-    # 5. Outer Border (to identify clipping/offset issues)
+
+@functools.lru_cache(maxsize=8)
+def _draw_background(width: int, height: int, guide: bool) -> Image.Image:
+    """
+    Draws the color bands (and optionally the guide text).
+
+    These do not depend on the settings, so they are drawn once per size
+    and cached; callers must copy the result before drawing on it.
+    """
+    _, bh, _, _ = _layout(width, height)
+
+    # Color bands at top, filled as row slices (the blue band includes
+    # its bottom edge row, as an inclusive rectangle would)
+    arr = np.zeros((height, width, 3), dtype=np.uint8)
+    arr[:bh] = (255, 0, 0)
+    arr[bh : bh * 2] = (0, 255, 0)
+    arr[bh * 2 : bh * 3 + 1] = (0, 0, 255)
+    img = Image.fromarray(arr)
+
+    if guide:
+        _draw_guide(ImageDraw.Draw(img), width, height)
+
+    return img
+
+
+def draw_lcd_test_pattern(
+    width: int,
+    height: int,
+    invert: bool,
+    bgr: bool,
+    index: int = 0,
+    total: int = 0,
+) -> Image.Image:
+    """
+    Draws a test pattern for LCD verification.
+
+    The colors are the same for every invert/bgr setting (the panel, not
+    the software, is what changes them), so only the status text is drawn
+    per call, on a copy of the cached background.
+    """
+    margin, bh, f_mid_size, _ = _layout(width, height)
+    f_mid = get_font(f_mid_size)
+
+    # 1. Display settings
+    y_offset = bh * 3 + margin
+    lines = []
+    if total > 0:
+        lines.append((y_offset, f"TEST {index}/{total}", "white"))
+        y_offset += f_mid_size + 4
+    conf_text = f"inv={invert}, bgr={bgr}"
+    lines.append((y_offset, conf_text, "cyan"))
+
+    # On short screens the settings may reach the guide, which must then
+    # be drawn on top of them (not taken from the cache)
+    text_bottom = y_offset + f_mid.getbbox(conf_text)[3]
+    guide_cached = text_bottom < _guide_top(width, height)
+
+    img = _draw_background(width, height, guide_cached).copy()
+    draw = ImageDraw.Draw(img)
+
+    for y, text, color in lines:
+        draw.text((margin, y), text, fill=color, font=f_mid)
+
+    # 2. Guide at bottom
+    if not guide_cached:
+        _draw_guide(draw, width, height)
+
+    # 3. Outer Border (to identify clipping/offset issues)
     # Draw a 1-pixel white border around the entire image
     draw.rectangle([0, 0, width - 1, height - 1], outline="white", width=1)
 
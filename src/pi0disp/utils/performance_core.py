@@ -6,8 +6,112 @@ performance_core.py - パフォーマンス最適化のためのコアモジュ
 直結するコアな最適化ロジックを提供します。
 """
 
+import functools
+import os
+
 import numpy as np
 
+try:
+    import numba
+    from numba import njit, prange, types
+
+    HAS_NUMBA = True
+except ImportError:  # numba はオプション (jit グループ)
+    HAS_NUMBA = False
+
+# RGB565 変換を行単位で並列化する最小画素数 (これ未満ではスレッドの
+# 起動コストの方が大きい)
+PARALLEL_MIN_PIXELS = 320 * 60
+
+
+def _numba_threads() -> int:
+    """
+    numba の並列処理に使うスレッド数を返します。
+
+    環境変数 `PI0DISP_NUMBA_THREADS` で上限を指定できます
+    (Pi 3 などで熱によるクロックダウンを避けたい場合)。
+    """
+    if not HAS_NUMBA:
+        return 1
+    threads = numba.config.NUMBA_NUM_THREADS
+    limit = os.environ.get("PI0DISP_NUMBA_THREADS")
+    if limit:
+        try:
+            threads = max(1, min(threads, int(limit)))
+        except ValueError:
+            pass
+        numba.set_num_threads(threads)
+    return threads
+
+
+NUMBA_THREADS = _numba_threads()
+
+
+@functools.lru_cache(maxsize=16)
+def gamma_lut(gamma: float, linear: bool = False) -> np.ndarray:
+    """
+    ガンマ補正用の LUT (256 要素, uint8) を返します。
+
+    ガンマ値ごとにキャッシュするので、同じガンマ値で何度呼んでも
+    テーブルの計算は1回だけです。返す配列は読み取り専用です。
+
+    Args:
+        gamma (float): ガンマ補正値。
+        linear (bool): True の場合、sRGB 値をいったんリニア (光量) に
+            戻してからガンマ補正し、sRGB に再エンコードするテーブルを
+            作ります。sRGB の非線形性とガンマが二重にかからないので
+            階調が自然になります (コストは通常の LUT と同じ)。
+    """
+    x = np.arange(256) / 255.0
+    if not linear:
+        lut = (255 * (x**gamma)).astype(np.uint8)
+    else:
+        lin = np.where(x <= 0.04045, x / 12.92, ((x + 0.055) / 1.055) ** 2.4)
+        y = lin**gamma
+        srgb = np.where(
+            y <= 0.0031308, 12.92 * y, 1.055 * y ** (1 / 2.4) - 0.055
+        )
+        lut = np.clip(srgb * 255 + 0.5, 0, 255).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+if HAS_NUMBA:
+
+    def _pack_rgb565_rows(rgb, out):
+        """
+        RGB (H, W, 3) を RGB565 (ビッグエンディアン) のバイト列に詰める。
+
+        `out` は (H, W * 2) の uint8 配列。
+        1ピクセルずつ上位バイト・下位バイトを直接書き込むので、
+        LUT 参照や 16bit 配列のバイトスワップが不要になる。
+        行ごとに独立しているので、parallel=True では行を各コアに分配する
+        (parallel=False の場合 prange は range と同じ)。
+        """
+        height, width = rgb.shape[0], rgb.shape[1]
+        for y in prange(height):
+            for x in range(width):
+                r = rgb[y, x, 0]
+                g = rgb[y, x, 1]
+                b = rgb[y, x, 2]
+                out[y, 2 * x] = (r & 0xF8) | (g >> 5)
+                out[y, 2 * x + 1] = ((g & 0x1C) << 3) | (b >> 3)
+
+    # 入力は読み取り専用配列 (`np.asarray(PIL.Image)` など) も受け付ける
+    _pack_rgb565 = njit(
+        types.void(
+            types.Array(types.uint8, 3, "A", readonly=True),
+            types.Array(types.uint8, 2, "C"),
+        ),
+        cache=True,
+        fastmath=True,
+    )(_pack_rgb565_rows)
+
+    # マルチコア (Pi 3/4/5) 用。使うときに初めてコンパイルする
+    _pack_rgb565_parallel = njit(cache=True, fastmath=True, parallel=True)(
+        _pack_rgb565_rows
+    )
+
 
 class ColorConverter:
     """
@@ -38,10 +142,7 @@ class ColorConverter:
         Args:
             gamma (float): 新しいガンマ補正値。
         """
-        self._gamma_lut = np.array(
-            [int(255 * ((i / 255.0) ** gamma)) for i in range(256)],
-            dtype=np.uint8,
-        )
+        self._gamma_lut = gamma_lut(gamma)
 
     def convert(
         self, rgb_array: np.ndarray, apply_gamma: bool = False
@@ -57,11 +158,26 @@ class ColorConverter:
             RGB565 形式のバイト列。
         """
         if apply_gamma:
-            rgb_array = self._gamma_lut[rgb_array]
+            rgb_array = np.take(self._gamma_lut, rgb_array)
+
+        if HAS_NUMBA and rgb_array.dtype == np.uint8:
+            out = np.empty(
+                (rgb_array.shape[0], rgb_array.shape[1] * 2), dtype=np.uint8
+            )
+            if (
+                NUMBA_THREADS > 1
+                and rgb_array.shape[0] * rgb_array.shape[1]
+                >= PARALLEL_MIN_PIXELS
+            ):
+                _pack_rgb565_parallel(rgb_array, out)
+            else:
+                _pack_rgb565(rgb_array, out)
+            return out.tobytes()
 
-        r = self._r_lut[rgb_array[:, :, 0]]
-        g = self._g_lut[rgb_array[:, :, 1]]
-        b = self._b_lut[rgb_array[:, :, 2]]
+        # np.take() は lut[idx] (ファンシーインデックス) の約2倍速い
+        r = np.take(self._r_lut, rgb_array[:, :, 0])
+        g = np.take(self._g_lut, rgb_array[:, :, 1])
+        b = np.take(self._b_lut, rgb_array[:, :, 2])
 
         # Big-endian 16-bit
         return (r | g | b).astype(">u2").tobytes()
@@ -126,3 +242,73 @@ class RegionOptimizer:
 
         # (x, y, w, h) 形式に戻す
         return [(r[0], r[1], r[2] - r[0], r[3] - r[1]) for r in work_regions]
+
+    @staticmethod
+    def batch_regions(
+        regions,
+        width: int,
+        height: int,
+        window_cost: int = 1024,
+        full_screen_ratio: float = 0.4,
+    ):
+        """
+        SPI転送用に、列範囲が重なる矩形を縦長の矩形にまとめます。
+
+        1回の転送ごとにウィンドウ設定 (CASET/RASET/RAMWR) のコストが
+        かかるため、余分に転送するピクセル数が `window_cost` 以下なら
+        まとめて1回で転送します。
+
+        Args:
+            regions: (x, y, w, h) のリスト (merge_regions の結果など)。
+            width, height: 画面サイズ。
+            window_cost (int): 転送1回分のコストをピクセル数に換算した値。
+            full_screen_ratio (float): 面積の合計が画面の この割合を
+                                       超えた場合は全画面を1回で転送する。
+
+        Returns:
+            (x, y, w, h) のリスト。
+        """
+        if not regions:
+            return []
+
+        total_area = sum(w * h for _, _, w, h in regions)
+        if total_area > width * height * full_screen_ratio:
+            return [(0, 0, width, height)]
+
+        # (x1, y1, x2, y2) 形式に変換
+        work_regions = [[x, y, x + w, y + h] for x, y, w, h in regions]
+
+        changed = True
+        while changed:
+            changed = False
+            new_regions = []
+            while work_regions:
+                r1 = work_regions.pop(0)
+                merged = False
+                for i in range(len(work_regions)):
+                    r2 = work_regions[i]
+
+                    # 列範囲が重ならない場合はまとめない
+                    if r1[0] >= r2[2] or r2[0] >= r1[2]:
+                        continue
+
+                    nx1 = min(r1[0], r2[0])
+                    ny1 = min(r1[1], r2[1])
+                    nx2 = max(r1[2], r2[2])
+                    ny2 = max(r1[3], r2[3])
+
+                    a1 = (r1[2] - r1[0]) * (r1[3] - r1[1])
+                    a2 = (r2[2] - r2[0]) * (r2[3] - r2[1])
+                    na = (nx2 - nx1) * (ny2 - ny1)
+
+                    if na - (a1 + a2) <= window_cost:
+                        work_regions[i] = [nx1, ny1, nx2, ny2]
+                        merged = True
+                        changed = True
+                        break
+
+                if not merged:
+                    new_regions.append(r1)
+            work_regions = new_regions
+
+        return [(r[0], r[1], r[2] - r[0], r[3] - r[1]) for r in work_regions]
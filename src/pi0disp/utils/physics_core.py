@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+physics_core.py - ボール物理演算のコアモジュール
+
+ballanime のボール移動・壁反射・ボール同士の衝突処理を、
+Structure of Arrays (cx, cy, vx, vy の float32 配列) 上で一括実行します。
+
+numba がインストールされている場合は `@njit` でネイティブコードに
+コンパイルされ、Python インタプリタのオーバーヘッドなしで動作します。
+numba が無い場合は `step_numpy()` (NumPy のベクトル演算による位置更新と
+全ペアのブロードキャスト判定による衝突処理) で同じ処理を行います。
+"""
+
+import functools
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """numba 未導入時の代替デコレータ (関数をそのまま返す)。"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def _decorator(func):
+            return func
+
+        return _decorator
+
+
+MAX_SPEED_SQ = 1000000.0  # speed^2での比較用（1000^2）
+TWO_PI = 2.0 * math.pi
+
+# step() のシグネチャ (宣言時にコンパイルする)
+STEP_SIGNATURE = "void(f4[:], f4[:], f4[:], f4[:], f4, i4, i4, i4, f4, b1)"
+
+
+@njit(STEP_SIGNATURE, cache=True, fastmath=True)
+def step(cx, cy, vx, vy, r, w, h, substeps, dt, collide):
+    """
+    1フレーム分の物理演算を実行する (配列はインプレースで更新)。
+
+    Args:
+        cx, cy: ボール中心座標の配列 (float32)。
+        vx, vy: ボール速度の配列 (float32, pixels/sec)。
+        r: ボール半径 (全ボール共通)。
+        w, h: 画面サイズ。
+        substeps: サブステップ数。
+        dt: サブステップあたりの経過時間 (秒)。
+        collide: ボール同士の衝突処理を行うかどうか。
+    """
+    n = cx.shape[0]
+    width_limit = w - r
+    height_limit = h - r
+
+    radii_sum = r * 2.0
+    radii_sum_sq = radii_sum * radii_sum
+    min_dist_sq = (radii_sum * 0.05) ** 2
+    sep = radii_sum * 0.55 * 0.5
+
+    for _ in range(substeps):
+        # 位置更新と壁反射 (分岐なし: 範囲外なら速度の符号を反転してクランプ)
+        for i in range(n):
+            x = cx[i] + vx[i] * dt
+            y = cy[i] + vy[i] * dt
+            vx[i] *= 1.0 - 2.0 * ((x <= r) | (x >= width_limit))
+            vy[i] *= 1.0 - 2.0 * ((y <= r) | (y >= height_limit))
+            cx[i] = min(max(x, r), width_limit - 1.0)
+            cy[i] = min(max(y, r), height_limit - 1.0)
+
+        if not collide:
+            continue
+
+        # ボール同士の衝突
+        for i in range(n):
+            for j in range(i + 1, n):
+                dx = cx[i] - cx[j]
+                dy = cy[i] - cy[j]
+                dist_sq = dx * dx + dy * dy
+                if dist_sq >= radii_sum_sq:
+                    continue
+
+                # 極近距離: ランダム方向に分離
+                if dist_sq <= min_dist_sq:
+                    angle = np.random.random() * TWO_PI
+                    sep_x = math.cos(angle) * sep
+                    sep_y = math.sin(angle) * sep
+                    cx[i] += sep_x
+                    cy[i] += sep_y
+                    cx[j] -= sep_x
+                    cy[j] -= sep_y
+                    continue
+
+                dist = math.sqrt(dist_sq)
+                inv_dist = 1.0 / dist
+                nx = dx * inv_dist
+                ny = dy * inv_dist
+
+                rel_v_normal = (vx[i] - vx[j]) * nx + (vy[i] - vy[j]) * ny
+                if rel_v_normal < 0:
+                    tx = -ny
+                    ty = nx
+                    v1n = vx[i] * nx + vy[i] * ny
+                    v1t = vx[i] * tx + vy[i] * ty
+                    v2n = vx[j] * nx + vy[j] * ny
+                    v2t = vx[j] * tx + vy[j] * ty
+
+                    new_v1x = v2n * nx + v1t * tx
+                    new_v1y = v2n * ny + v1t * ty
+                    new_v2x = v1n * nx + v2t * tx
+                    new_v2y = v1n * ny + v2t * ty
+
+                    if (
+                        new_v1x * new_v1x + new_v1y * new_v1y <= MAX_SPEED_SQ
+                        and new_v2x * new_v2x + new_v2y * new_v2y
+                        <= MAX_SPEED_SQ
+                    ):
+                        vx[i] = new_v1x
+                        vy[i] = new_v1y
+                        vx[j] = new_v2x
+                        vy[j] = new_v2y
+
+                # 位置補正
+                overlap = radii_sum - dist
+                if overlap > 0:
+                    correction = overlap * 0.4
+                    cx[i] += correction * nx
+                    cy[i] += correction * ny
+                    cx[j] -= correction * nx
+                    cy[j] -= correction * ny
+
+
+def integrate(cx, cy, vx, vy, r, w, h, dt):
+    """
+    位置更新と壁反射を NumPy のベクトル演算で一括実行する (numba 不要)。
+
+    配列はインプレースで更新されます。引数は `step()` と同じです。
+    """
+    for c, v, limit in ((cx, vx, w - r), (cy, vy, h - r)):
+        c += v * dt
+        # 分岐なし: 範囲外の要素だけ速度の符号を反転してクランプ
+        hit = (c <= r) | (c >= limit)
+        np.negative(v, out=v, where=hit)
+        np.clip(c, r, limit - 1.0, out=c)
+
+
+@functools.lru_cache(maxsize=8)
+def _upper_pairs(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """n 個のボールのすべてのペア (i < j) のインデックス配列。"""
+    return np.triu_indices(n, 1)
+
+
+def colliding_pairs(cx, cy, radii_sum_sq: float, pairs=None):
+    """
+    距離の二乗が `radii_sum_sq` 未満のペアをブロードキャストで抽出する。
+
+    Args:
+        cx, cy: ボール中心座標の配列。
+        radii_sum_sq (float): 衝突とみなす距離の二乗。
+        pairs: 候補ペア (i, j) のリスト。None の場合はすべてのペア。
+
+    Returns:
+        list[tuple[int, int]]: 衝突しているペアのリスト。
+    """
+    pi, pj = _colliding_indices(cx, cy, radii_sum_sq, pairs)
+    return list(zip(pi.tolist(), pj.tolist()))
+
+
+def _colliding_indices(cx, cy, radii_sum_sq: float, pairs):
+    """`colliding_pairs()` の本体。インデックス配列 (pi, pj) を返す。"""
+    if pairs is None:
+        pi, pj = _upper_pairs(cx.shape[0])
+    elif not pairs:
+        pi = pj = np.empty(0, dtype=np.intp)
+    else:
+        pi, pj = np.array(pairs, dtype=np.intp).T
+    if pi.size == 0:
+        return pi, pj
+
+    dx = cx[pi] - cx[pj]
+    dy = cy[pi] - cy[pj]
+    hit = dx * dx + dy * dy < radii_sum_sq
+    return pi[hit], pj[hit]
+
+
+def collide_pairs(cx, cy, vx, vy, r, pairs):
+    """
+    候補ペアについてボール同士の衝突処理を行う (配列はインプレースで更新)。
+
+    numba が無い場合の `step()` の衝突処理に相当します。
+    複数のボールと接触しているボールがあるので、ペアは1つずつ順に
+    解決します (速度の上限チェックも解決後の速度に対して行われる)。
+
+    Args:
+        cx, cy, vx, vy: `step()` と同じ float32 配列。
+        r: ボール半径 (全ボール共通)。
+        pairs: 衝突候補のインデックスのペア (i, j) のリスト。
+               None の場合はすべてのペアを候補とする。
+    """
+    radii_sum = r * 2.0  # 全ボール同サイズなので事前計算
+    radii_sum_sq = radii_sum * radii_sum
+    min_dist_sq = (radii_sum * 0.05) ** 2
+
+    # 距離の判定は NumPy で一括して行い、
+    # 以降の処理は実際に衝突しているペアだけにする
+    pi, pj = _colliding_indices(cx, cy, radii_sum_sq, pairs)
+    if pi.size == 0:
+        return
+    pairs = zip(pi.tolist(), pj.tolist())
+
+    # ループ内で使う関数をローカル変数に束縛 (属性探索の削減)
+    sqrt = math.sqrt
+    cos = math.cos
+    sin = math.sin
+    random = np.random.random
+
+    # スカラー演算は Python の list の方が速い
+    xs = cx.tolist()
+    ys = cy.tolist()
+    vxs = vx.tolist()
+    vys = vy.tolist()
+
+    for i, j in pairs:
+        # 距離計算（平方根回避）
+        dx = xs[i] - xs[j]
+        dy = ys[i] - ys[j]
+        dist_sq = dx * dx + dy * dy
+
+        # 早期リターン（衝突していない）
+        if dist_sq >= radii_sum_sq:
+            continue
+
+        # 極近距離処理
+        if dist_sq <= min_dist_sq:
+            # ランダム分離
+            angle = random() * TWO_PI
+            sep_dist = radii_sum * 0.55
+
+            sep_x = cos(angle) * sep_dist * 0.5
+            sep_y = sin(angle) * sep_dist * 0.5
+
+            xs[i] += sep_x
+            ys[i] += sep_y
+            xs[j] -= sep_x
+            ys[j] -= sep_y
+            continue
+
+        # 通常の衝突処理
+        # 平方根計算を1回のみ実行
+        dist = sqrt(dist_sq)
+        inv_dist = 1.0 / dist  # 除算を1回のみ
+        nx = dx * inv_dist
+        ny = dy * inv_dist
+
+        # 相対速度計算
+        rel_vx = vxs[i] - vxs[j]
+        rel_vy = vys[i] - vys[j]
+        rel_v_normal = rel_vx * nx + rel_vy * ny
+
+        # 接近している場合のみ処理
+        if rel_v_normal < 0:
+            # 接線ベクトル
+            tx = -ny
+            ty = nx
+
+            # 速度成分分解
+            v1n = vxs[i] * nx + vys[i] * ny
+            v1t = vxs[i] * tx + vys[i] * ty
+            v2n = vxs[j] * nx + vys[j] * ny
+            v2t = vxs[j] * tx + vys[j] * ty
+
+            # 速度交換
+            new_v1x = v2n * nx + v1t * tx
+            new_v1y = v2n * ny + v1t * ty
+            new_v2x = v1n * nx + v2t * tx
+            new_v2y = v1n * ny + v2t * ty
+
+            # 速度上限チェック（二乗比較で高速化）
+            if (
+                new_v1x * new_v1x + new_v1y * new_v1y <= MAX_SPEED_SQ
+                and new_v2x * new_v2x + new_v2y * new_v2y <= MAX_SPEED_SQ
+            ):
+                vxs[i] = new_v1x
+                vys[i] = new_v1y
+                vxs[j] = new_v2x
+                vys[j] = new_v2y
+
+        # 位置補正
+        overlap = radii_sum - dist
+        if overlap > 0:
+            correction = overlap * 0.4  # 補正係数
+            correction_x = correction * nx
+            correction_y = correction * ny
+
+            xs[i] += correction_x
+            ys[i] += correction_y
+            xs[j] -= correction_x
+            ys[j] -= correction_y
+
+    cx[:] = xs
+    cy[:] = ys
+    vx[:] = vxs
+    vy[:] = vys
+
+
+def step_numpy(cx, cy, vx, vy, r, w, h, substeps, dt, collide):
+    """
+    numba が無い場合の `step()` (配列はインプレースで更新)。
+
+    サブステップのループも含めて1回の呼び出しで1フレーム分を処理します。
+    衝突判定は全ペアをブロードキャストで行います (画面に収まる
+    ボール数 (30 個程度) では候補ペアの絞り込みは不要)。
+
+    Args:
+        cx, cy, vx, vy, r, w, h, substeps, dt, collide: `step()` と同じ。
+    """
+    for _ in range(substeps):
+        integrate(cx, cy, vx, vy, r, w, h, dt)
+        if collide:
+            collide_pairs(cx, cy, vx, vy, r, None)
+
+
+class BallSystem:
+    """
+    全ボールの状態を Structure of Arrays で保持するクラス。
+
+    位置 (cx, cy) と速度 (vx, vy) を float32 配列で持ち、
+    1フレーム分の物理演算を `step()` の1回の呼び出しで実行します。
+    numba があれば JIT 版の `step()`、無ければ `step_numpy()` を使います。
+    """
+
+    __slots__ = ("cx", "cy", "vx", "vy", "radius", "colors", "_step")
+
+    def __init__(self, cx, cy, vx, vy, radius: float, colors=None):
+        """
+        Args:
+            cx, cy: ボール中心座標のシーケンス。
+            vx, vy: ボール速度のシーケンス (pixels/sec)。
+            radius (float): ボール半径 (全ボール共通)。
+            colors: ボールの色 (R, G, B) のリスト。
+        """
+        # 配列は step() のシグネチャに合わせて float32
+        self.cx = np.array(cx, dtype=np.float32)
+        self.cy = np.array(cy, dtype=np.float32)
+        self.vx = np.array(vx, dtype=np.float32)
+        self.vy = np.array(vy, dtype=np.float32)
+        self.radius = float(radius)
+        self.colors = list(colors) if colors is not None else []
+
+        self._step = step if HAS_NUMBA else step_numpy
+
+    @classmethod
+    def from_balls(cls, balls, radius: float):
+        """
+        ボールオブジェクト (cx, cy, speed_x, speed_y, fill_color 属性を持つ)
+        のリストから作成する。
+        """
+        return cls(
+            [b.cx for b in balls],
+            [b.cy for b in balls],
+            [b.speed_x for b in balls],
+            [b.speed_y for b in balls],
+            radius,
+            colors=[b.fill_color for b in balls],
+        )
+
+    def __len__(self) -> int:
+        return self.cx.shape[0]
+
+    def step(self, w: int, h: int, substeps: int, dt: float, collide: bool):
+        """1フレーム分の物理演算を実行する (サブステップを含む)。"""
+        self._step(
+            self.cx,
+            self.cy,
+            self.vx,
+            self.vy,
+            self.radius,
+            w,
+            h,
+            substeps,
+            dt,
+            collide,
+        )
+
+    def bboxes(self) -> np.ndarray:
+        """各ボールの外接矩形 (x0, y0, x1, y1) を (N, 4) の int 配列で返す。"""
+        r = self.radius
+        return (
+            np.stack([self.cx - r, self.cy - r, self.cx + r, self.cy + r])
+            .astype(np.int64)
+            .T
+        )
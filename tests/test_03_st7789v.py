@@ -2,7 +2,9 @@
 
 from unittest.mock import patch
 
+import numpy as np
 import pytest
+from PIL import Image
 
 from pi0disp.disp.st7789v import ST7789V
 
@@ -62,6 +64,26 @@ def test_invon_off_commands(mock_pigpio):
     disp2.close()
 
 
+def test_set_invert_and_bgr(mock_pigpio):
+    """set_invert / set_bgr は初期化をやり直さずにコマンドだけ送る."""
+    disp = ST7789V(invert=False, bgr=False)
+    disp.set_rotation(0)
+    with patch.object(disp, "init_display") as mock_init:
+        mock_pigpio.spi_write.reset_mock()
+        disp.set_invert(True)
+        mock_pigpio.spi_write.assert_any_call(1, [0x21])  # INVON
+        assert disp._invert is True
+
+        mock_pigpio.spi_write.reset_mock()
+        disp.set_bgr(True)
+        mock_pigpio.spi_write.assert_any_call(1, [0x36])  # MADCTL
+        mock_pigpio.spi_write.assert_any_call(1, [0x08])  # BGR ビット
+        assert disp._bgr is True
+        assert disp.rotation == 0
+    mock_init.assert_not_called()
+    disp.close()
+
+
 def test_set_rotation(mock_pigpio):
     """set_rotation でサイズと MADCTL が正しく更新されるか."""
     disp = ST7789V()
@@ -93,3 +115,86 @@ def test_close(mock_pigpio):
     mock_pigpio.spi_write.assert_any_call(1, [0x28])  # DISPOFF
     mock_pigpio.spi_write.assert_any_call(1, [0x10])  # SLPIN
     assert mock_pigpio.spi_close.called
+
+
+def test_display_region_accepts_ndarray(mock_pigpio):
+    """display_region に NumPy 配列を渡しても PIL Image と同じ転送になる."""
+    disp = ST7789V()
+    rng = np.random.default_rng(0)
+    w, h = disp.size.width, disp.size.height
+    fb = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+    with patch.object(disp, "write_pixels") as mock_write:
+        disp.display_region(Image.fromarray(fb), 10, 20, 50, 60)
+        disp.display_region(fb, 10, 20, 50, 60)
+
+    from_image, from_array = (c.args[0] for c in mock_write.call_args_list)
+    assert from_array == from_image
+    assert disp._last_image.crop((10, 20, 50, 60)).tobytes() == (
+        fb[20:60, 10:50].tobytes()
+    )
+    disp.close()
+
+
+def test_set_window_skips_unchanged(mock_pigpio):
+    """前回と同じ CASET/RASET は送らず、RAMWR だけを送る."""
+    disp = ST7789V()
+    disp.set_window(0, 0, 9, 9)
+
+    mock_pigpio.spi_write.reset_mock()
+    disp.set_window(0, 0, 9, 9)
+    assert mock_pigpio.spi_write.call_args_list == [((1, [0x2C]),)]
+
+    # 行だけ変わった場合は RASET だけを送る
+    mock_pigpio.spi_write.reset_mock()
+    disp.set_window(0, 20, 9, 29)
+    sent = [c.args[1] for c in mock_pigpio.spi_write.call_args_list]
+    assert sent == [[0x2B], [0, 20, 0, 29], [0x2C]]
+
+    # 回転を変えると次は両方送り直す
+    disp.set_rotation(disp.rotation)
+    mock_pigpio.spi_write.reset_mock()
+    disp.set_window(0, 20, 9, 29)
+    sent = [c.args[1] for c in mock_pigpio.spi_write.call_args_list]
+    assert [0x2A] in sent and [0x2B] in sent
+    disp.close()
+
+
+def test_display_rgb565(mock_pigpio):
+    """変換済みの RGB565 データを全画面に書き込む."""
+    disp = ST7789V()
+    w, h = disp.size.width, disp.size.height
+    pixel_bytes = bytes(w * h * 2)
+
+    with patch.object(disp, "write_pixels") as mock_write:
+        disp.display_rgb565(pixel_bytes)
+    mock_write.assert_called_once_with(pixel_bytes)
+    # 元画像が無いので次回の display() は全画面更新になる
+    assert disp._last_image is None
+
+    with pytest.raises(ValueError):
+        disp.display_rgb565(pixel_bytes[:-2])
+    disp.close()
+
+
+def test_display_rgb565_skips_unchanged(mock_pigpio):
+    """直前と同じ全画面データは再送しない."""
+    disp = ST7789V()
+    w, h = disp.size.width, disp.size.height
+    frame_a = bytes(w * h * 2)
+    frame_b = b"\xff" * (w * h * 2)
+
+    with patch.object(disp, "write_pixels", wraps=disp.write_pixels) as wp:
+        disp.display_rgb565(frame_a)
+        disp.display_rgb565(bytes(frame_a))  # 同じ内容
+        assert wp.call_count == 1
+        disp.display_rgb565(frame_a, full=True)  # 強制
+        assert wp.call_count == 2
+        disp.display_rgb565(frame_b)
+        assert wp.call_count == 3
+
+        # 部分更新を挟むと前回の全画面データは無効になる
+        disp.display_region(Image.new("RGB", (w, h)), 0, 0, 10, 10)
+        disp.display_rgb565(frame_b)
+        assert wp.call_count == 5
+    disp.close()
@@ -1,8 +1,12 @@
 """Tests for 'image' command."""
 
+import io
+import sys
 from unittest.mock import MagicMock, patch
 
 from click.testing import CliRunner
+from PIL import Image
+from PIL.JpegImagePlugin import JpegImageFile
 
 from pi0disp.commands.image import image
 
@@ -51,3 +55,55 @@ def test_image_help(cli_mock_env):
     result = runner.invoke(image, ["--help"])
     assert result.exit_code == 0
     assert "Displays an image" in result.output
+
+
+@patch("pi0disp.commands.image.ST7789V")
+def test_image_svg_in_memory(mock_st7789v, tmp_path, cli_mock_env):
+    """SVG は一時ファイルを作らずメモリ上で PNG に変換する."""
+    runner, _, _ = cli_mock_env
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), "red").save(buf, format="PNG")
+    cairosvg = MagicMock()
+    cairosvg.svg2png.return_value = buf.getvalue()
+
+    svg_path = tmp_path / "test.svg"
+    svg_path.write_text("<svg/>")
+    mock_lcd = MagicMock()
+    mock_lcd.size.width = 240
+    mock_lcd.size.height = 320
+    mock_st7789v.return_value.__enter__.return_value = mock_lcd
+
+    with patch.dict(sys.modules, {"cairosvg": cairosvg}):
+        result = runner.invoke(image, [str(svg_path), "--svg", "-s", "0"])
+
+    assert result.exit_code == 0
+    # 表示サイズで直接ラスタライズする
+    cairosvg.svg2png.assert_called_once_with(
+        url=str(svg_path), output_width=240, output_height=320
+    )
+    assert mock_lcd.display.called
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["test.svg"]
+
+
+@patch("pi0disp.commands.image.ST7789V")
+def test_image_jpeg_draft(mock_st7789v, tmp_path, cli_mock_env):
+    """大きな JPEG は縮小デコード (draft) してから表示する."""
+    runner, _, _ = cli_mock_env
+    jpg_path = tmp_path / "big.jpg"
+    Image.new("RGB", (2000, 1500), "green").save(jpg_path)
+    mock_lcd = MagicMock()
+    mock_lcd.size.width = 240
+    mock_lcd.size.height = 320
+    mock_st7789v.return_value.__enter__.return_value = mock_lcd
+
+    draft = JpegImageFile.draft
+    with patch(
+        "PIL.JpegImagePlugin.JpegImageFile.draft", autospec=True
+    ) as mock_draft:
+        mock_draft.side_effect = lambda img, *args: draft(img, *args)
+        result = runner.invoke(image, [str(jpg_path), "-s", "0"])
+
+    assert result.exit_code == 0
+    mock_draft.assert_called_once()
+    assert mock_draft.call_args.args[1:] == ("RGB", (480, 640))
+    assert mock_lcd.display.call_args.args[0].size == (240, 320)
@@ -2,7 +2,7 @@
 
 from unittest.mock import MagicMock, patch
 
-from pi0disp.commands.rgb import rgb
+from pi0disp.commands.rgb import generate_rgb_circles, rgb
 
 
 @patch("pi0disp.commands.rgb.ST7789V")
@@ -31,7 +31,7 @@ def test_rgb_success(mock_sleep, mock_st7789v_patch, cli_mock_env):
 
     # KeyboardInterrupt で抜けた場合
     assert result.exit_code in [0, 1]
-    assert mock_lcd.display.called
+    assert mock_lcd.display_rgb565.called
 
 
 def test_rgb_help(cli_mock_env):
@@ -40,3 +40,48 @@ def test_rgb_help(cli_mock_env):
     result = runner.invoke(rgb, ["--help"])
     assert result.exit_code == 0
     assert "RGB Circles" in result.output
+
+
+def test_generate_rgb_circles_additive():
+    """3つの円の重なりは加算 (255 で飽和) になる."""
+    img = generate_rgb_circles(
+        240, 320, ((255, 0, 0), (0, 255, 0), (0, 0, 255))
+    )
+    assert img.size == (240, 320)
+    assert img.getpixel((0, 0)) == (0, 0, 0)
+    # 3つの円が重なる中央付近は白
+    assert img.getpixel((120, 180)) == (255, 255, 255)
+
+    # 同じチャンネルの重なりも桁あふれせずに 255 で止まる
+    img = generate_rgb_circles(
+        240, 320, ((200, 0, 0), (200, 0, 0), (200, 0, 0))
+    )
+    assert img.getpixel((120, 180)) == (255, 0, 0)
+
+
+@patch("pi0disp.commands.rgb.ColorConverter")
+@patch("pi0disp.commands.rgb.generate_rgb_circles")
+@patch("pi0disp.commands.rgb.ST7789V")
+@patch("time.sleep")
+def test_rgb_generates_images_once(
+    mock_sleep,
+    mock_st7789v_patch,
+    mock_generate,
+    mock_converter,
+    cli_mock_env,
+):
+    """画像の生成と RGB565 変換は最初に1回ずつだけ行う."""
+    runner, _, _ = cli_mock_env
+    mock_lcd = MagicMock()
+    mock_lcd.size.width = 240
+    mock_lcd.size.height = 320
+    mock_st7789v_patch.return_value.__enter__.return_value = mock_lcd
+
+    # 2周 (6回表示) したところで止める
+    mock_sleep.side_effect = [None] * 5 + [KeyboardInterrupt("Stop loop")]
+
+    runner.invoke(rgb, ["--duration", "0.1"])
+
+    assert mock_generate.call_count == 3
+    assert mock_converter.return_value.convert.call_count == 3
+    assert mock_lcd.display_rgb565.call_count == 6
@@ -111,3 +111,25 @@ def test_lcd_check_pattern_content(cli_mock_env, mock_st7789v):
     assert isinstance(pixel, tuple)
     r, g, b = pixel[:3]
     assert r == 0 and g == 0 and b == 0
+
+
+def test_lcd_check_sends_only_changes(cli_mock_env, mock_st7789v):
+    """2回目以降は変更のあった設定のコマンドだけを送る."""
+    runner, _, _ = cli_mock_env
+    mock_st7789v._invert = False
+    mock_st7789v._bgr = False
+    mock_st7789v.set_invert.side_effect = lambda v: setattr(
+        mock_st7789v, "_invert", v
+    )
+    mock_st7789v.set_bgr.side_effect = lambda v: setattr(
+        mock_st7789v, "_bgr", v
+    )
+
+    result = runner.invoke(lcd_check, ["--wait", "0.01"])
+
+    assert result.exit_code == 0
+    assert mock_st7789v.init_display.call_count == 0
+    # inv: F->T->T->F->F, bgr: F->F->T->F->T
+    assert mock_st7789v.set_invert.call_count == 2
+    assert mock_st7789v.set_bgr.call_count == 3
+    assert mock_st7789v.display.call_count == 4
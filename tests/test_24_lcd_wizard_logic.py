@@ -3,7 +3,10 @@
 #
 import pytest
 
-from pi0disp.utils.lcd_test_pattern import determine_lcd_settings
+from pi0disp.utils.lcd_test_pattern import (
+    determine_lcd_settings,
+    draw_lcd_test_pattern,
+)
 
 
 def test_determine_lcd_settings():
@@ -41,3 +44,14 @@ def test_determine_lcd_settings():
 def test_determine_lcd_settings_invalid():
     with pytest.raises(ValueError):
         determine_lcd_settings(False, False, "unknown", "black")
+
+
+def test_draw_lcd_test_pattern_reuses_background():
+    # 背景はキャッシュされるが、描画結果が互いに影響しないこと
+    a = draw_lcd_test_pattern(240, 320, False, False, 1, 4)
+    b = draw_lcd_test_pattern(240, 320, True, True, 2, 4)
+    assert a.tobytes() != b.tobytes()
+    assert draw_lcd_test_pattern(240, 320, False, False, 1, 4) == a
+
+    # 帯の色は設定によらず同じ (色を変えるのはパネル側)
+    assert a.getpixel((120, 5)) == b.getpixel((120, 5)) == (255, 0, 0)
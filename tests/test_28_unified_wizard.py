@@ -5,7 +5,12 @@
 
 from unittest.mock import MagicMock, patch
 
-from pi0disp.commands.lcd_check_wizard import ClickWizardUI, LCDWizard
+from pi0disp.commands.lcd_check_wizard import (
+    ClickWizardUI,
+    LCDWizard,
+    WizardState,
+    WizardUI,
+)
 
 
 @patch("pi0disp.commands.lcd_check_wizard.draw_lcd_test_pattern")
@@ -36,13 +41,12 @@ def test_lcd_wizard_loop(mock_draw):
             "y_offset": 0,
         }
 
-        # 設定変更ごとに _last_image = None が設定されているはず
-        assert disp._last_image is None
         assert disp._invert is True
         assert disp._bgr is True
 
-        # 設定変更ごとに _last_image = None が設定されているはず
-        assert disp._last_image is None
+        # 初回と回転の変更は全画面、invert/bgr の変更は差分で更新
+        fulls = [c.kwargs["full"] for c in disp.display.call_args_list]
+        assert fulls == [True, True, False, False]
 
         # 各種設定変更メソッドが呼ばれていること
         disp.set_rotation.assert_any_call(0)
@@ -52,3 +56,139 @@ def test_lcd_wizard_loop(mock_draw):
         # 描画が呼ばれていること
         assert mock_draw.called
         assert disp.display.called
+
+
+@patch("pi0disp.commands.lcd_check_wizard.draw_lcd_test_pattern")
+def test_lcd_wizard_sends_only_changes(mock_draw):
+    """Init sequence runs once; later keys send only what changed."""
+    disp = MagicMock()
+    disp.size.width = 240
+    disp.size.height = 320
+    disp.rotation = 0
+
+    ui = ClickWizardUI()
+
+    # 'i' (invert), 'i' (back), 'x' (unknown key), ENTER
+    with patch("click.getchar", side_effect=["i", "i", "x", "\r"]):
+        LCDWizard(disp, ui).run()
+
+    assert disp.init_display.call_count == 1
+    assert disp.set_rotation.call_count == 1
+    assert disp.set_invert.call_count == 2
+    # 初回 + invert 変更2回 (未知のキーでは再描画しない)
+    assert disp.display.call_count == 3
+
+
+@patch("pi0disp.commands.lcd_check_wizard.draw_lcd_test_pattern")
+def test_lcd_wizard_reuses_patterns(mock_draw):
+    """Each (size, invert, bgr) pattern is drawn only once."""
+    disp = MagicMock()
+    disp.size.width = 240
+    disp.size.height = 320
+    disp.rotation = 0
+    disp._invert = False
+    disp._bgr = False
+
+    ui = ClickWizardUI()
+
+    # 'i' (invert), 'i' (back), 'l' (offset only), ENTER
+    with patch("click.getchar", side_effect=["i", "i", "l", "\r"]):
+        LCDWizard(disp, ui).run()
+
+    assert mock_draw.call_count == 2
+    mock_draw.assert_any_call(240, 320, False, False)
+    mock_draw.assert_any_call(240, 320, True, False)
+    # オフセットの変更では画像全体がずれるので全画面を送り直す
+    fulls = [c.kwargs["full"] for c in disp.display.call_args_list]
+    assert fulls == [True, False, False, True]
+
+
+def test_click_wizard_ui_cbreak_once(monkeypatch):
+    """On a terminal, keys are read in one cbreak session."""
+    import os
+    import pty
+    import termios
+
+    master, slave = pty.openpty()
+    try:
+        monkeypatch.setattr("sys.stdin", os.fdopen(slave, closefd=False))
+        before = termios.tcgetattr(slave)
+        ui = ClickWizardUI()
+
+        with patch("click.getchar") as mock_getchar:
+            with ui.key_input():
+                assert not termios.tcgetattr(slave)[3] & termios.ICANON
+                os.write(master, b"ig")
+                assert ui.get_key() == "i"
+                assert ui.get_key() == "g"
+            mock_getchar.assert_not_called()
+
+        assert termios.tcgetattr(slave) == before
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+def test_click_wizard_ui_status_written_on_change(capsys):
+    """ステータス行は内容が変わった時だけ書き出す."""
+    ui = ClickWizardUI()
+    state = WizardState(0, False, False, 0, 0)
+
+    ui.show_status(state)
+    ui.show_status(state)
+    assert capsys.readouterr().out.count("\rCurrent:") == 1
+
+    state.update_by_key("i")
+    ui.show_status(state)
+    assert "Inv:True" in capsys.readouterr().out
+
+
+def test_click_wizard_ui_escape_sequence_is_one_key(monkeypatch):
+    """矢印キーのエスケープシーケンスは1つのキーとして読む."""
+    import os
+    import pty
+
+    master, slave = pty.openpty()
+    try:
+        monkeypatch.setattr("sys.stdin", os.fdopen(slave, closefd=False))
+        ui = ClickWizardUI()
+        with ui.key_input():
+            os.write(master, b"\x1b[C")  # Right
+            assert ui.get_key() == "\x1b[C"
+            os.write(master, b"a")
+            assert ui.get_key() == "a"
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+def test_lcd_wizard_ignores_arrow_keys():
+    """矢印キーで回転 (a-d) が変わらない."""
+
+    class KeysUI(WizardUI):
+        def __init__(self, keys):
+            self.keys = iter(keys)
+
+        def get_key(self):
+            return next(self.keys)
+
+        def show_status(self, state):
+            pass
+
+        def show_help(self):
+            pass
+
+    disp = MagicMock()
+    disp.size.width = 240
+    disp.size.height = 320
+    disp.rotation = 90
+    disp._invert = False
+    disp._bgr = False
+    disp._x_offset = 0
+    disp._y_offset = 0
+
+    keys = ["\x1b[A", "\x1b[B", "\x1b[C", "\x1b[D", "\r"]
+    with patch("pi0disp.commands.lcd_check_wizard.draw_lcd_test_pattern"):
+        result = LCDWizard(disp, KeysUI(keys)).run()
+
+    assert result["rotation"] == 90
@@ -0,0 +1,47 @@
+#
+# (c) 2026 Yoichi Tanibayashi
+#
+"""Tests for lazy loading of subcommands and package exports."""
+
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from pi0disp.__main__ import COMMANDS, cli
+
+
+def test_cli_lists_all_commands():
+    """ヘルプには全サブコマンドが表示される."""
+    ctx = cli.make_context("pi0disp", [], resilient_parsing=True)
+    assert cli.list_commands(ctx) == sorted(COMMANDS)
+
+
+def test_cli_bl_does_not_import_numpy():
+    """`bl` の起動で NumPy/Numba を import しない."""
+    code = (
+        "import sys\n"
+        "from click.testing import CliRunner\n"
+        "from pi0disp.__main__ import cli\n"
+        "result = CliRunner().invoke(cli, ['bl', '--help'])\n"
+        "assert result.exit_code == 0, result.output\n"
+        "heavy = {'numpy', 'numba', 'PIL'} & set(sys.modules)\n"
+        "assert not heavy, heavy\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_package_exports_are_loaded_on_access():
+    """パッケージの公開名は最初のアクセス時に import される."""
+    import pi0disp
+    from pi0disp.disp.st7789v import ST7789V
+
+    assert pi0disp.ST7789V is ST7789V
+    assert "ST7789V" in pi0disp.__all__
+
+
+def test_cli_runs_lazy_command():
+    """サブコマンドは呼び出し時に読み込まれて実行される."""
+    result = CliRunner().invoke(cli, ["bl", "--help"])
+    assert result.exit_code == 0
+    assert "backlight" in result.output
@@ -13,25 +13,25 @@ def test_ballanime_multiple_captures(cli_mock_env):
     with (
         patch("pi0disp.commands.ballanime.ST7789V") as mock_st7789v_class,
         patch("time.sleep"),
-        patch("time.time") as mock_time,
+        patch("time.monotonic_ns") as mock_time,
         patch("PIL.Image.Image.save") as mock_save,
     ):
         mock_st7789v_class.return_value.__enter__.return_value = mock_lcd
 
-        # Generator to provide increasing time and eventually stop the loop
+        # Generator to provide increasing time (ns) and eventually stop
         def time_gen():
-            yield 100.0  # FpsCounter.__init__
-            yield 100.0  # _loop last_frame_time init
+            yield 100_000_000_000  # FpsCounter.__init__
+            yield 100_000_000_000  # _loop last_frame_ns init
 
             # Loop 1
-            yield 101.1  # current_time (triggers capture)
-            yield 101.1  # FpsCounter.update
-            yield 101.1  # wait_time check
+            yield 101_100_000_000  # current_ns (triggers capture)
+            yield 101_100_000_000  # FpsCounter.update
+            yield 101_100_000_000  # wait_ns check
 
             # Loop 2
-            yield 102.2  # current_time (triggers capture)
-            yield 102.2  # FpsCounter.update
-            yield 102.2  # wait_time check
+            yield 102_200_000_000  # current_ns (triggers capture)
+            yield 102_200_000_000  # FpsCounter.update
+            yield 102_200_000_000  # wait_ns check
 
             # Stop
             raise KeyboardInterrupt
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from unittest.mock import MagicMock, patch
 
+import pytest
 from PIL import Image
 
 from pi0disp.commands.ballanime import Ball, _loop
@@ -88,3 +89,49 @@ def test_cairo_optimized_mode_calls_display_region():
     # display_region が呼ばれたか確認
     assert lcd.display_region.called
     assert not lcd.display.called
+
+
+def test_loop_sleeps_until_absolute_deadline():
+    """sleep の寝過ごし分は次のフレームの待ち時間から差し引かれる."""
+    lcd = MagicMock()
+    lcd.size.width = 320
+    lcd.size.height = 240
+    bg = Image.new("RGB", (320, 240), (0, 0, 0))
+    ball = Ball(
+        x=100, y=100, radius=20, speed=100, angle=0, fill_color=(255, 0, 0)
+    )
+    fps_counter = MagicMock()
+    fps_counter.fps_text = "FPS: 10"
+    tracker = MagicMock()
+    tracker.should_stop.side_effect = [False] * 3 + [True]
+
+    # 描画は時間ゼロ、sleep は毎回 5ms 寝過ごす時計
+    clock = [0]
+    sleeps = []
+
+    def fake_sleep(sec):
+        sleeps.append(sec)
+        clock[0] += int(sec * 1e9) + 5_000_000
+
+    with (
+        patch("time.monotonic_ns", side_effect=lambda: clock[0]),
+        patch("time.sleep", side_effect=fake_sleep),
+    ):
+        _loop(lcd, bg, [ball], fps_counter, None, 10.0, tracker=tracker)
+
+    assert len(sleeps) == 3
+    assert abs(sleeps[0] - 0.1) < 1e-6
+    assert all(abs(s - 0.095) < 1e-6 for s in sleeps[1:])
+
+
+def test_loop_rejects_unknown_mode():
+    """未知のモードはフレームを描画する前にエラーになる."""
+    lcd = MagicMock()
+    lcd.size.width = 320
+    lcd.size.height = 240
+    bg = Image.new("RGB", (320, 240), (0, 0, 0))
+
+    with pytest.raises(ValueError, match="Unknown mode"):
+        _loop(lcd, bg, [], MagicMock(), None, 30.0, mode="pil")
+
+    assert not lcd.display.called
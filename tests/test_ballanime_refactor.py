@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
-from pi0disp.commands.ballanime import Ball
+import numpy as np
+
+from pi0disp.commands.ballanime import Ball, _ball_dirty_regions
 from pi0disp.utils.sprite import CircleSprite
 
 
@@ -36,3 +38,17 @@ def test_ball_dirty_region():
     # 記録更新
     ball.record_current_bbox()
     assert ball.get_dirty_region() is None
+
+
+def test_ball_dirty_regions_soa():
+    # Ball.get_dirty_region() と同じ領域を一括で計算する
+    prev = np.array([[80, 80, 120, 120], [0, 0, 40, 40]])
+    cur = np.array([[90, 85, 130, 125], [0, 0, 40, 40]])
+
+    # 初回は全ボールの現在の矩形
+    assert _ball_dirty_regions(prev, None) == [
+        [78, 78, 44, 44],
+        [-2, -2, 44, 44],
+    ]
+    # 移動したボールだけ
+    assert _ball_dirty_regions(cur, prev) == [[78, 78, 54, 49]]
@@ -1,5 +1,13 @@
 # -*- coding: utf-8 -*-
-from pi0disp.utils.performance_core import RegionOptimizer
+import numpy as np
+import pytest
+
+from pi0disp.utils import performance_core
+from pi0disp.utils.performance_core import (
+    ColorConverter,
+    RegionOptimizer,
+    gamma_lut,
+)
 
 
 def test_region_optimizer_merge_overlapping():
@@ -39,3 +47,73 @@ def test_region_optimizer_merge_with_threshold():
     # 元の合計面積: 200, マージ後: 250 -> 1.25倍なのでマージされるはず
     assert len(merged) == 1
     assert merged[0] == (10, 10, 25, 10)
+
+
+def test_region_optimizer_batch_same_columns():
+    optimizer = RegionOptimizer()
+    # 同じ列範囲で縦に並んだ矩形は1回の転送にまとめる
+    regions = [(10, 10, 40, 40), (10, 55, 40, 40)]
+    batched = optimizer.batch_regions(regions, 320, 240)
+    assert batched == [(10, 10, 40, 85)]
+
+
+def test_region_optimizer_batch_separate_columns():
+    optimizer = RegionOptimizer()
+    # 列範囲が重ならない矩形はまとめない
+    regions = [(10, 10, 40, 40), (100, 10, 40, 40)]
+    assert len(optimizer.batch_regions(regions, 320, 240)) == 2
+
+
+def test_region_optimizer_batch_full_screen():
+    optimizer = RegionOptimizer()
+    # 面積の合計が画面の 40% を超えたら全画面を転送する
+    regions = [(0, 0, 200, 100), (0, 120, 200, 100)]
+    assert optimizer.batch_regions(regions, 320, 240) == [(0, 0, 320, 240)]
+
+
+def test_gamma_lut_cached():
+    lut = gamma_lut(2.2)
+    # ガンマ値ごとにキャッシュされ、書き換えられない
+    assert gamma_lut(2.2) is lut
+    assert not lut.flags.writeable
+    expected = [int(255 * ((i / 255.0) ** 2.2)) for i in range(256)]
+    assert lut.tolist() == expected
+    assert np.array_equal(gamma_lut(1.0), np.arange(256))
+
+
+def test_gamma_lut_linear():
+    # リニア空間でのガンマ補正: gamma=1.0 は恒等変換、端点は変わらない
+    assert np.array_equal(gamma_lut(1.0, linear=True), np.arange(256))
+    lut = gamma_lut(2.2, linear=True)
+    assert lut is not gamma_lut(2.2)
+    assert lut[0] == 0 and lut[255] == 255
+    assert np.all(np.diff(lut.astype(int)) >= 0)
+    # sRGB 128 (リニア約 0.216) -> 0.216 ** 2.2 = 約 0.034 -> sRGB 約 51
+    assert abs(int(lut[128]) - 51) <= 1
+
+
+@pytest.mark.skipif(not performance_core.HAS_NUMBA, reason="numba 未導入")
+def test_color_converter_numba_matches_lut(monkeypatch):
+    cc = ColorConverter()
+    rgb = np.random.default_rng(0).integers(0, 256, (24, 32, 3), np.uint8)
+    fast = cc.convert(rgb)
+    fast_view = cc.convert(rgb[4:20, 3:30])  # 連続していない配列
+    readonly = rgb.copy()
+    readonly.flags.writeable = False
+    assert cc.convert(readonly) == fast  # 読み取り専用配列
+
+    monkeypatch.setattr(performance_core, "HAS_NUMBA", False)
+    assert fast == cc.convert(rgb)
+    assert fast_view == cc.convert(rgb[4:20, 3:30])
+
+
+@pytest.mark.skipif(not performance_core.HAS_NUMBA, reason="numba 未導入")
+def test_color_converter_numba_parallel(monkeypatch):
+    cc = ColorConverter()
+    rgb = np.random.default_rng(1).integers(0, 256, (24, 32, 3), np.uint8)
+    serial = cc.convert(rgb)
+
+    # 行単位の並列版 (マルチコア向け) も同じ結果になること
+    monkeypatch.setattr(performance_core, "NUMBA_THREADS", 2)
+    monkeypatch.setattr(performance_core, "PARALLEL_MIN_PIXELS", 1)
+    assert cc.convert(rgb) == serial
@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
+from unittest.mock import patch
 
 import numpy as np
 from PIL import Image
 
 from pi0disp.utils.performance_core import ColorConverter
 from pi0disp.utils.utils import (
+    ImageProcessor,
     clamp_region,
     merge_bboxes,
     pil_to_rgb565_bytes,
+    sleep_until,
 )
 
 
@@ -64,3 +67,35 @@ def test_pil_to_rgb565_bytes():
     # 4 pixels * 2 bytes = 8 bytes. All pixels should be 0xF800
     assert len(data) == 8
     assert data == b"\xf8\x00\xf8\x00\xf8\x00\xf8\x00"
+
+
+def test_resize_with_aspect_ratio_resample():
+    """LANCZOS only for real downscaling unless a filter is forced."""
+    processor = ImageProcessor()
+    rng = np.random.default_rng(0)
+    large = Image.fromarray(rng.integers(0, 256, (960, 1280, 3), np.uint8))
+    near = Image.fromarray(rng.integers(0, 256, (300, 400, 3), np.uint8))
+
+    def resize(img, resample=None):
+        return processor.resize_with_aspect_ratio(
+            img, 320, 240, resample=resample
+        ).tobytes()
+
+    # 2倍以上の縮小は LANCZOS
+    assert resize(large) == resize(large, Image.Resampling.LANCZOS)
+
+    # 目標サイズに近い場合は BILINEAR (resample で強制も可能)
+    assert resize(near) == resize(near, Image.Resampling.BILINEAR)
+    assert resize(near) != resize(near, Image.Resampling.LANCZOS)
+
+
+@patch("time.sleep")
+@patch("time.monotonic", return_value=10.0)
+def test_sleep_until(mock_monotonic, mock_sleep):
+    """残り時間だけ sleep し、期限を過ぎていれば sleep しない。"""
+    sleep_until(10.25)
+    mock_sleep.assert_called_once_with(0.25)
+
+    mock_sleep.reset_mock()
+    sleep_until(9.0)
+    mock_sleep.assert_not_called()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from pi0disp.utils import physics_core
+
+
+def _arrays(*balls):
+    cx = np.array([b[0] for b in balls], dtype=np.float32)
+    cy = np.array([b[1] for b in balls], dtype=np.float32)
+    vx = np.array([b[2] for b in balls], dtype=np.float32)
+    vy = np.array([b[3] for b in balls], dtype=np.float32)
+    return cx, cy, vx, vy
+
+
+def test_step_moves_balls():
+    cx, cy, vx, vy = _arrays((100, 100, 100, 50))
+    physics_core.step(cx, cy, vx, vy, 20.0, 320, 240, 4, 0.01, True)
+    assert cx[0] == np.float32(104.0)
+    assert cy[0] == np.float32(102.0)
+
+
+def test_step_wall_bounce():
+    # 左の壁に向かって移動 -> 反射して速度が反転する
+    cx, cy, vx, vy = _arrays((21, 100, -200, 0))
+    physics_core.step(cx, cy, vx, vy, 20.0, 320, 240, 1, 0.01, False)
+    assert cx[0] == 20.0
+    assert vx[0] > 0
+
+
+def test_step_collision_swaps_velocity():
+    # 正面衝突 -> 速度が交換され、重なりが補正される
+    cx, cy, vx, vy = _arrays((100, 100, 100, 0), (135, 100, -100, 0))
+    physics_core.step(cx, cy, vx, vy, 20.0, 320, 240, 1, 0.001, True)
+    assert vx[0] < 0
+    assert vx[1] > 0
+    assert cx[1] - cx[0] > 35
+
+
+def test_step_without_collision():
+    cx, cy, vx, vy = _arrays((100, 100, 100, 0), (135, 100, -100, 0))
+    physics_core.step(cx, cy, vx, vy, 20.0, 320, 240, 1, 0.001, False)
+    assert vx[0] > 0
+    assert vx[1] < 0
+
+
+def test_integrate_matches_step():
+    rng = np.random.default_rng(2)
+    cx = rng.uniform(20, 300, 16).astype(np.float32)
+    cy = rng.uniform(20, 220, 16).astype(np.float32)
+    vx = rng.uniform(-300, 300, 16).astype(np.float32)
+    vy = rng.uniform(-300, 300, 16).astype(np.float32)
+    expected = [a.copy() for a in (cx, cy, vx, vy)]
+
+    for _ in range(50):
+        physics_core.integrate(cx, cy, vx, vy, 20.0, 320, 240, 0.01)
+        physics_core.step(*expected, 20.0, 320, 240, 1, 0.01, False)
+
+    for actual, exp in zip((cx, cy, vx, vy), expected):
+        np.testing.assert_allclose(actual, exp, rtol=1e-4)
+
+
+def test_step_numpy_collision_swaps_velocity():
+    cx, cy, vx, vy = _arrays((100, 100, 100, 0), (135, 100, -100, 0))
+    physics_core.step_numpy(cx, cy, vx, vy, 20.0, 320, 240, 1, 0.001, True)
+    assert vx[0] < 0
+    assert vx[1] > 0
+    assert cx[1] - cx[0] > 35
+
+
+def test_ball_system_step_and_bboxes():
+    system = physics_core.BallSystem(
+        [100, 200],
+        [100, 100],
+        [100, 0],
+        [50, 0],
+        20.0,
+        colors=[(1, 2, 3)] * 2,
+    )
+    assert len(system) == 2
+    system.step(320, 240, 4, 0.01, True)
+    assert system.cx[0] == np.float32(104.0)
+    assert system.cy[0] == np.float32(102.0)
+    assert system.bboxes().tolist() == [
+        [84, 82, 124, 122],
+        [180, 80, 220, 120],
+    ]
+
+
+def test_colliding_pairs_broadcast():
+    cx = np.array([100, 135, 300, 310], dtype=np.float32)
+    cy = np.array([100, 100, 200, 200], dtype=np.float32)
+    assert physics_core.colliding_pairs(cx, cy, 40.0**2) == [(0, 1), (2, 3)]
+    # 候補ペアを指定した場合はその中から抽出する
+    pairs = [(0, 1), (0, 2), (1, 3)]
+    assert physics_core.colliding_pairs(cx, cy, 40.0**2, pairs) == [(0, 1)]
+
+
+def test_collide_pairs_multiple_contacts_speed_capped():
+    # 密集したボール (1つのボールが複数のボールと同時に接触) でも
+    # 衝撃が積み重なって速度上限を超えないこと
+    rng = np.random.default_rng(4)
+    balls = []
+    for row in range(6):
+        for col in range(10):
+            angle = rng.uniform(0, 2 * np.pi)
+            balls.append(
+                (
+                    30 + col * 30,
+                    30 + row * 30,
+                    900 * np.cos(angle),
+                    900 * np.sin(angle),
+                )
+            )
+    cx, cy, vx, vy = _arrays(*balls)
+    pairs = physics_core.colliding_pairs(cx, cy, 40.0**2)
+    contacts = np.bincount(np.array(pairs).ravel(), minlength=len(balls))
+    assert contacts.max() >= 4
+
+    physics_core.collide_pairs(cx, cy, vx, vy, 20.0, None)
+
+    speed_sq = vx.astype(np.float64) ** 2 + vy.astype(np.float64) ** 2
+    assert speed_sq.max() <= physics_core.MAX_SPEED_SQ * (1 + 1e-5)